@@ -10,7 +10,7 @@ import time # Para implementar reintentos
 import os # Para acceder a variables de entorno
 from pika.exceptions import AMQPConnectionError # Para manejar errores específicos de conexión
 import secrets
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Importamos las dependencias de auth
 from app.auth.infrastructure.persistence.database import SessionLocal as AuthSessionLocal, create_tables
@@ -28,7 +28,7 @@ def generate_access_token() -> str:
 
 def calculate_expires_at(hours: int = 1) -> datetime:
     """Calcula la fecha de expiración."""
-    return datetime.utcnow() + timedelta(hours=hours)
+    return datetime.now(timezone.utc) + timedelta(hours=hours)
 
 # --- Lógica de procesamiento de mensajes ---
 
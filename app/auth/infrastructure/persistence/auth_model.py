@@ -1,7 +1,7 @@
 from sqlalchemy import Column, String, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Importamos Base desde la infraestructura compartida
 from app.users.infrastructure.persistence.database import Base
@@ -14,11 +14,12 @@ class TokenModel(Base):
     """
     __tablename__ = 'tokens'
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), nullable=False) # FK implícita
+    # `as_uuid=False`: los IDs viajan como `str`, el mismo tipo que usa el dominio (igual que `users.id`)
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), nullable=False) # FK implícita
     access_token = Column(String(255), unique=True, nullable=False, index=True)
-    expires_at = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
     def __repr__(self):
         return f"<TokenModel(id='{self.id}', user_id='{self.user_id}', expires_at='{self.expires_at}')>"
@@ -29,8 +30,10 @@ class TokenModel(Base):
 # 1. `Base`: Reutilizamos la Base de users para estar en la misma metadata.
 # 2. `__tablename__`: Nombre de la tabla en la BD.
 # 3. `Column`, `String`, `DateTime`, `UUID`: Tipos de datos de SQLAlchemy.
+#    `UUID(as_uuid=False)` también funciona en motores sin UUID nativo (p.ej. SQLite en las pruebas).
 # 4. `primary_key=True`: Define la clave primaria.
 # 5. `unique=True` y `index=True` en `access_token`: Para búsquedas rápidas y unicidad.
 # 6. `nullable=False`: Campos obligatorios.
-# 7. `default=`: Valor por defecto para `created_at`.
-# 8. Sin lógica de negocio: Solo mapeo de datos.
\ No newline at end of file
+# 7. `default=`: Valor por defecto para `created_at` (aware en UTC, `utcnow` está deprecado).
+# 8. `DateTime(timezone=True)`: Las fechas se guardan con zona horaria, igual que las genera el dominio.
+# 9. Sin lógica de negocio: Solo mapeo de datos.
\ No newline at end of file
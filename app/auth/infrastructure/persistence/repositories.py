@@ -1,6 +1,7 @@
 # SQLALCHEMY TOKEN REPOSITORY (ADAPTADOR CONCRETO)
 # Esta capa implementa el puerto `TokenRepository` definido en el dominio.
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session # Para tipar la sesión
 from typing import Optional # Para retornos opcionales
 from datetime import timezone
@@ -52,20 +53,27 @@ class SQLAlchemyTokenRepository(TokenRepository):
         Busca un token por su valor de acceso desde la base de datos.
         Returns: Optional[Token]: La instancia del Token del dominio si se encuentra, None en caso contrario.
         """
-        # Realiza la consulta usando SQLAlchemy
-        token_model: TokenModel = self._db_session.query(TokenModel).filter(TokenModel.access_token == access_token).first()
+        # Realiza la consulta usando SQLAlchemy (`scalar` devuelve el primer modelo o None)
+        token_model: Optional[TokenModel] = self._db_session.scalar(
+            select(TokenModel).where(TokenModel.access_token == access_token)
+        )
 
         # Si no se encuentra, retorna None
         if not token_model:
             return None
 
-        # Esto crea un datetime aware para evitar errores con el formato de la DB
-        expires_at_aware = token_model.expires_at.replace(tzinfo=timezone.utc)
+        # Normalizar a UTC aware: la columna es `timezone=True`, pero filas antiguas o
+        # motores sin soporte de zona horaria pueden devolver un datetime naive (asumido UTC)
+        expires_at = token_model.expires_at
+        if expires_at.tzinfo is None:
+            expires_at_aware = expires_at.replace(tzinfo=timezone.utc)
+        else:
+            expires_at_aware = expires_at.astimezone(timezone.utc)
 
         # Si se encuentra, crea y retorna una instancia del dominio
         token_domain = Token(
-            token_id=str(token_model.id),
-            user_id=str(token_model.user_id),
+            token_id=token_model.id, # Ya es `str` (UUID(as_uuid=False))
+            user_id=token_model.user_id,
             access_token=token_model.access_token,
             expires_at=expires_at_aware
         )
@@ -78,24 +86,20 @@ class SQLAlchemyTokenRepository(TokenRepository):
         Elimina un token por su ID desde la base de datos.
         Returns: bool: True si el token fue eliminado, False si no se encontró.
         """
-        # Busca el modelo por ID
-        token_model: TokenModel = self._db_session.query(TokenModel).filter(TokenModel.id == token_id).first()
-
-        # Si no se encuentra, retorna False
-        if not token_model:
-            return False
-
-        # Si se encuentra, lo elimina de la sesión
-        self._db_session.delete(token_model)
+        # Un solo DELETE por ID: no se carga la fila antes de borrarla
+        stmt = delete(TokenModel).where(TokenModel.id == token_id)
         try:
+            result = self._db_session.execute(stmt)
             # Intenta hacer commit de la transacción
             self._db_session.commit()
-            return True # Retorna True si se eliminó con éxito
         except Exception as e:
             # Si hay un error, hace rollback y relanza la excepción
             self._db_session.rollback()
             raise RuntimeError(f"Error al eliminar el token de la base de datos: {e}") from e
 
+        # True si se eliminó alguna fila, False si no se encontró
+        return result.rowcount > 0
+
 
 # --- Notas sobre la implementación ---
 # Herencia: `SQLAlchemyTokenRepository` hereda de `TokenRepository`.
@@ -105,9 +109,9 @@ class SQLAlchemyTokenRepository(TokenRepository):
 #  entre capas:
 #    - `save`: Convierte `Token` (dominio) -> `TokenModel` (SQLAlchemy) -> BD.
 #    - `find_by_access_token`: Convierte BD -> `TokenModel` (SQLAlchemy) -> `Token` (dominio).
-#    - `delete`: Busca y elimina `TokenModel` en BD.
+#    - `delete`: Elimina `TokenModel` en BD con una sola sentencia `DELETE`.
 #    Esta traducción es el corazón del patrón Adaptador.
-# Uso de SQLAlchemy: Utiliza la sesión para queries y persistir cambios.
+# Uso de SQLAlchemy: Utiliza la sesión para queries estilo 2.0 (`select` + `scalar`) y persistir cambios.
 #    Se adhiere a las prácticas comunes de SQLAlchemy.
 # Sin lógica de negocio: Solo se encarga de la persistencia.
 #    Respeta el principio de separación de capas.
\ No newline at end of file
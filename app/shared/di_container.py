@@ -11,6 +11,9 @@ PATRÓN DE DISEÑO: Service Locator (Variante simple de Contenedor DI)
 ARQUITECTURA: Facilita la Inversión de Dependencias en Arquitectura Hexagonal
 """
 
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncContextManager, AsyncIterator, ContextManager, Iterator
+
 # --- Importaciones de Interfaces del Dominio (Puertos) ---
 # Abstracciones que define el dominio/core de la aplicación.
 # Los adaptadores primarios dependerán de estas interfaces, no de implementaciones.
@@ -20,8 +23,11 @@ from app.auth.domain.repositories import TokenRepository
 # --- Importaciones de Implementaciones Concretas (Adaptadores de Infraestructura) ---
 # El objetivo es que ningún otro archivo del proyecto tenga que importar directamente
 from app.users.infrastructure.persistence.repositories import SQLAlchemyUserRepository
+from app.users.infrastructure.persistence.async_repositories import AsyncSQLAlchemyUserRepository
 from app.auth.infrastructure.persistence.repositories import SQLAlchemyTokenRepository
 from app.users.infrastructure.persistence.database import SessionLocal as UsersSessionLocal
+from app.users.infrastructure.persistence.database import session_scope as users_session_scope
+from app.users.infrastructure.persistence.database import async_session_scope as users_async_session_scope
 from app.auth.infrastructure.persistence.database import SessionLocal as AuthSessionLocal
 
 # Importamos otras dependencias concretas si es necesario (ej: publisher)
@@ -41,6 +47,25 @@ def create_user_repository() -> UserRepository:
     repo = SQLAlchemyUserRepository(db_session)
     return repo
 
+@contextmanager
+def create_user_unit_of_work() -> Iterator[UserRepository]:
+    """
+    Fábrica de la Unidad de Trabajo para escrituras del contexto 'users'.
+    Entrega un UserRepository ligado a una sesión nueva y hace UN solo commit al salir
+    del bloque `with` (rollback si se lanza una excepción).
+    """
+    with users_session_scope() as db_session:
+        yield SQLAlchemyUserRepository(db_session)
+
+@asynccontextmanager
+async def create_async_user_unit_of_work() -> AsyncIterator[AsyncSQLAlchemyUserRepository]:
+    """
+    Fábrica de la Unidad de Trabajo asíncrona del contexto 'users'.
+    Igual que `create_user_unit_of_work`, pero con `AsyncSession` para código `async`.
+    """
+    async with users_async_session_scope() as db_session:
+        yield AsyncSQLAlchemyUserRepository(db_session)
+
 def create_token_repository() -> TokenRepository:
     """
     Fábrica para crear una instancia de TokenRepository.
@@ -62,6 +87,8 @@ def create_rabbitmq_publisher() -> RabbitMQPublisher:
 # Un diccionario simple que actúa como registro.
 _DEPENDENCY_REGISTRY = {
     "user_repository": create_user_repository,
+    "user_unit_of_work": create_user_unit_of_work,
+    "async_user_unit_of_work": create_async_user_unit_of_work,
     "token_repository": create_token_repository,
     "rabbitmq_publisher": create_rabbitmq_publisher
 }
@@ -100,6 +127,23 @@ def get_user_repository() -> UserRepository:
     return get_dependency("user_repository")
 
 
+def get_user_unit_of_work() -> ContextManager[UserRepository]:
+    """
+    Alias tipado para obtener la Unidad de Trabajo de 'users'.
+    Punto de entrada para adaptadores que escriben (p.ej. el worker de RabbitMQ).
+    Uso: with get_user_unit_of_work() as user_repo: handle_create_user(command, user_repo)
+    """
+    return get_dependency("user_unit_of_work")
+
+
+def get_async_user_unit_of_work() -> AsyncContextManager[AsyncSQLAlchemyUserRepository]:
+    """
+    Alias tipado para obtener la Unidad de Trabajo asíncrona de 'users'.
+    Uso: async with get_async_user_unit_of_work() as user_repo: user = await user_repo.get_by_id(user_id)
+    """
+    return get_dependency("async_user_unit_of_work")
+
+
 def get_token_repository() -> TokenRepository:
     """
     Alias tipado para obtener TokenRepository.
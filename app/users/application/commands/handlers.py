@@ -19,7 +19,7 @@ def handle_create_user(
     Coordina entre el comando de entrada, las dependencias y el dominio.
     Returns: str: El ID del usuario creado.
     Raises:
-        ValueError: Si hay errores en validación o creación de entidad.
+        ValueError: Si hay errores en validación, creación de entidad o el email ya existe.
         RuntimeError: Si hay errores de persistencia.
     """
     
@@ -39,13 +39,17 @@ def handle_create_user(
     except Exception as e:  # Captura excepciones del dominio (InvalidEmailError, etc.)
         raise ValueError(f"Error al crear la entidad de usuario: {e}")
 
-    # Guardar el usuario usando el repositorio inyectado
+    # Guardar el usuario usando el repositorio inyectado.
+    # `save_if_new` comprueba la unicidad del email y escribe en una sola operación atómica.
     try:
-        user_repository.save(user)
+        created = user_repository.save_if_new(user)
     except Exception as e:
-        # Manejar errores de persistencia (por ejemplo, email duplicado en BD)
+        # Manejar errores de persistencia
         raise RuntimeError(f"Error al guardar el usuario en el repositorio: {e}")
 
+    if not created:
+        raise ValueError(f"Ya existe un usuario con el email '{user.email}'.")
+
     # Retornar el ID del usuario creado
     return user_id
 
@@ -1,6 +1,9 @@
 import re
 from typing import Optional
 
+# Expresión regular básica para validar email (compilada una sola vez al importar el módulo)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 class InvalidEmailError(Exception):
     """ Excepción lanzada cuando un email no es válido. """
     pass
@@ -9,6 +12,17 @@ class WeakPasswordError(Exception):
     """ Excepción lanzada cuando una contraseña no cumple con los criterios mínimos. """
     pass
 
+class UserNotFoundError(Exception):
+    """ Excepción lanzada cuando se intenta modificar un usuario que no existe. """
+    pass
+
+class UserPersistenceError(RuntimeError):
+    """
+    Excepción lanzada cuando el repositorio no puede persistir un usuario.
+    El error técnico original viaja en `__cause__` (se formatea solo si alguien lo registra).
+    """
+    pass
+
 class User:
     """
     Representa un Usuario en el dominio.
@@ -16,6 +30,10 @@ class User:
     Es una ENTIDAD del dominio con identidad única e igualdad por ID.
     """
 
+    # Sin `__dict__` por instancia: objetos más pequeños y acceso a atributos más rápido
+    # (cada lectura del repositorio construye un `User`)
+    __slots__ = ("_id", "_name", "_email", "_hashed_password")
+
     def __init__(self, user_id: str, name: str, email: str, hashed_password: str):
         """
         Inicializa un nuevo Usuario.
@@ -33,6 +51,21 @@ class User:
         self._email = email.lower()
         self._hashed_password = hashed_password
 
+    @classmethod
+    def from_row(cls, *, user_id: str, name: str, email: str, hashed_password: str) -> "User":
+        """
+        Reconstruye un Usuario ya persistido SIN volver a validar.
+        Los datos se validaron al crear la entidad antes de guardarla, así que las lecturas
+        del repositorio no repiten la regex de email en cada petición.
+        Uso exclusivo de adaptadores de persistencia (datos de confianza).
+        """
+        user = cls.__new__(cls)
+        user._id = user_id
+        user._name = name
+        user._email = email # Ya se guardó normalizado en minúsculas
+        user._hashed_password = hashed_password
+        return user
+
     @property
     def id(self) -> str:
         """ Obtiene el ID del usuario. """
@@ -73,9 +106,8 @@ class User:
         Returns: bool: True si es válido, False si no
         """
         
-        # Expresión regular básica para validar email
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        # Usa el patrón precompilado del módulo
+        return _EMAIL_RE.match(email) is not None
 
 
     def __eq__(self, other) -> bool:
@@ -91,12 +123,15 @@ class User:
         return f"<User(id='{self.id}', name='{self.name}', email='{self.email}')>"
 
 # --- Notas sobre la implementación ---
-# Excepciones personalizadas: Creamos `InvalidEmailError` para encapsular errores
+# Excepciones personalizadas: Creamos `InvalidEmailError` y `UserNotFoundError` para encapsular errores
 #    específicos del dominio. Esto es parte de las buenas prácticas.
+#    `UserPersistenceError` hereda de `RuntimeError` para no romper a quien ya captura ese tipo.
+# `__slots__`: Los atributos privados se declaran de forma fija; no se pueden añadir atributos nuevos.
+# `from_row`: Rehidrata desde persistencia sin validar; las reglas se aplican en `__init__` al crear.
 # Propiedades (`@property`): Usamos getters para encapsular el acceso a los atributos.
 # Setters con validación: El setter de `name` incluye una validación básica.
 # `_is_valid_email`: Método interno para validar el email. Mantiene la lógica de negocio
-#    dentro del dominio.
+#    dentro del dominio. El patrón `_EMAIL_RE` se compila una sola vez a nivel de módulo.
 # `__eq__` y `__repr__`: Métodos mágicos para facilitar comparaciones y debugging.
 
 # Rol en la Arquitectura
@@ -17,6 +17,34 @@ class UserRepository(ABC):
         pass
 
 
+    @abstractmethod
+    def save_if_new(self, user: User) -> bool:
+        """
+        Guarda un usuario solo si su email no está registrado todavía.
+        La comprobación y la escritura deben ser una única operación atómica.
+        Returns: bool: True si se guardó, False si ya existía un usuario con ese email.
+        """
+        pass
+
+
+    @abstractmethod
+    def update(self, user: User) -> None:
+        """
+        Actualiza los datos de un usuario existente (identificado por su ID).
+        Raises: UserNotFoundError: Si no existe un usuario con ese ID.
+        """
+        pass
+
+
+    @abstractmethod
+    def delete(self, user_id: str) -> bool:
+        """
+        Elimina un usuario por su ID.
+        Returns: bool: True si se eliminó, False si no existía.
+        """
+        pass
+
+
     @abstractmethod
     def get_by_id(self, user_id: str) -> Optional[User]:
         """
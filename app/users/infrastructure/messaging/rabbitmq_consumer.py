@@ -15,11 +15,8 @@ from ...application.commands.create_user_command import CreateUserCommand
 # Importamos el handler que procesará el comando
 from ...application.commands.handlers import handle_create_user
 
-# Importamos la interfaz para el tipado y claridad
-from app.users.domain.repositories import UserRepository
-
 # Importamos el DI Container para obtener dependencias
-from app.shared.di_container import get_user_repository
+from app.shared.di_container import get_user_unit_of_work
 
 # Importa la función create_tables para asegurar que las tablas existen
 from ...infrastructure.persistence.database import create_tables
@@ -69,17 +66,11 @@ def process_create_user_command(command_data: Dict[str, Any]):
         user_id=command_data.get("user_id")
     )
 
-    # Obtenemos directamente la interfaz UserRepository del contenedor DI.
-    try:
-        user_repository: UserRepository = get_user_repository() # INYECCION DEL CONTENEDORD DI
-        print("[.] UserRepository obtenido del DI container.")
-    except Exception as e:
-        print(f"[!] Error al obtener UserRepository del DI container: {e}")
-        return
-    
+    # Unidad de Trabajo del contenedor DI: un solo commit por mensaje procesado.
     try:
-        # Invocar al handler de aplicación
-        user_id = handle_create_user(command, user_repository) # INYECCION DEL HANDLER
+        with get_user_unit_of_work() as user_repository: # INYECCION DEL CONTENEDOR DI
+            # Invocar al handler de aplicación
+            user_id = handle_create_user(command, user_repository) # INYECCION DEL HANDLER
         print(f"[.] Successfully created user with ID: {user_id}")
     except Exception as e:
         print(f"[!] Error processing CreateUserCommand: {e}")
@@ -0,0 +1,165 @@
+# PUERTO SECUNDARIO (variante asíncrona)
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Union
+
+# Importamos la entidad de dominio
+from ...domain.models import User, UserNotFoundError, UserPersistenceError # MODELO DE DOMINIO
+# Importamos el modelo de SQLAlchemy
+from .user_model import UserModel #ADAPTADOR
+# Sentencias SQL compartidas con el adaptador síncrono
+from .user_statements import (
+    SELECT_USER_BY_EMAIL,
+    SELECT_USER_BY_ID,
+    delete_user,
+    insert_user_if_new,
+    normalize_user_id,
+    to_domain,
+    update_user,
+)
+# Caché de lecturas compartida (coherente con las transacciones)
+from .user_cache import (
+    cache_user,
+    evict_user_after_commit,
+    get_cached_user_by_id,
+    read_snapshot,
+)
+
+class AsyncSQLAlchemyUserRepository:
+    """
+    Implementación asíncrona del repositorio de usuarios usando `AsyncSession` (asyncpg).
+    Expone los mismos métodos que `SQLAlchemyUserRepository` (`save`, `save_if_new`, `update`,
+    `delete`, `get_by_id`, `get_by_email`), pero `async`, para que los adaptadores `async`
+    migren módulo a módulo sin bloquear el event loop.
+    """
+
+    def __init__(self, db_session: AsyncSession):
+        """ Inicializa el repositorio con una sesión asíncrona de SQLAlchemy. """
+        self._db_session = db_session
+
+
+    async def save(self, user: User) -> None:
+        """
+        Guarda un usuario NUEVO en la base de datos (solo INSERT; para cambios usar `update`).
+        No hace commit: la transacción la cierra la Unidad de Trabajo (`async_session_scope`).
+        Raises: UserPersistenceError: Si hay un error al guardar el usuario en la base de datos.
+        """
+        user_model = UserModel(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            hashed_password=user.hashed_password,
+        )
+
+        # Igual que en la versión síncrona: SAVEPOINT para que un fallo no aborte la transacción exterior
+        try:
+            async with self._db_session.begin_nested():
+                self._db_session.add(user_model)
+        except Exception as e:
+            raise UserPersistenceError("Error al guardar el usuario en la base de datos.") from e
+
+        evict_user_after_commit(self._db_session, user.id)
+
+
+    async def save_if_new(self, user: User) -> bool:
+        """
+        Inserta el usuario solo si su email no existe (`INSERT ... ON CONFLICT DO NOTHING RETURNING id`).
+        Returns: bool: True si se insertó, False si el email ya estaba registrado.
+        Raises: UserPersistenceError: Si hay un error al guardar el usuario en la base de datos
+                (solo se revierte el SAVEPOINT: la sesión sigue utilizable, como en `save`).
+        """
+        try:
+            async with self._db_session.begin_nested(): # Como en `save`: un fallo no aborta la transacción exterior
+                inserted_id = await self._db_session.scalar(insert_user_if_new(user))
+        except Exception as e:
+            raise UserPersistenceError("Error al guardar el usuario en la base de datos.") from e
+
+        if inserted_id is None:
+            return False # Conflicto: el email ya existe
+
+        evict_user_after_commit(self._db_session, user.id)
+        return True
+
+
+    async def update(self, user: User) -> None:
+        """
+        Actualiza un usuario existente con UN solo `UPDATE ... WHERE id = ?`.
+        Raises:
+            UserNotFoundError: Si no existe un usuario con ese ID.
+            UserPersistenceError: Si hay un error al actualizar el usuario en la base de datos.
+        """
+        try:
+            result = await self._db_session.execute(update_user(user))
+        except Exception as e:
+            raise UserPersistenceError("Error al actualizar el usuario en la base de datos.") from e
+
+        if result.rowcount == 0:
+            raise UserNotFoundError(f"No existe un usuario con ID '{user.id}'.")
+
+        evict_user_after_commit(self._db_session, user.id)
+
+
+    async def delete(self, user_id: str) -> bool:
+        """
+        Elimina un usuario por su ID con UN solo `DELETE ... WHERE id = ?`.
+        Returns: bool: True si el usuario fue eliminado, False si no se encontró.
+        Raises: UserPersistenceError: Si hay un error al eliminar el usuario de la base de datos.
+        """
+        try:
+            result = await self._db_session.execute(delete_user(user_id))
+        except Exception as e:
+            raise UserPersistenceError("Error al eliminar el usuario de la base de datos.") from e
+
+        evict_user_after_commit(self._db_session, user_id)
+        return result.rowcount > 0
+
+
+    async def get_by_id(self, user_id: Union[str, uuid.UUID]) -> Optional[User]:
+        """
+        Obtiene un usuario por su ID (acepta `str` o `uuid.UUID`, como la versión síncrona).
+        Returns: Optional[User]: La instancia del User del dominio si se encuentra, None en caso contrario.
+        """
+        user_id = normalize_user_id(user_id)
+
+        cached_user = get_cached_user_by_id(user_id)
+        if cached_user is not None:
+            return cached_user
+
+        snapshot = read_snapshot(self._db_session) # Antes del SELECT (ver `user_cache`)
+        user_model: Optional[UserModel] = await self._db_session.scalar(
+            SELECT_USER_BY_ID, {"user_id": user_id}
+        )
+        if not user_model:
+            return None
+
+        user_domain = to_domain(user_model)
+        cache_user(user_domain, snapshot)
+        return user_domain
+
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """
+        Obtiene un usuario por su correo electrónico.
+        No usa la caché: es la búsqueda del login y debe ver siempre las credenciales vigentes.
+        Returns: Optional[User]: La instancia del User del dominio si se encuentra, None en caso contrario.
+        """
+        user_model: Optional[UserModel] = await self._db_session.scalar(
+            SELECT_USER_BY_EMAIL, {"email": email}
+        )
+        if not user_model:
+            return None
+        return to_domain(user_model)
+
+# --- Notas sobre la implementación ---
+# Mismos métodos que `SQLAlchemyUserRepository`, pero `async`; los llamadores migran de uno en uno.
+# Sin herencia de `UserRepository`: El puerto del dominio es síncrono; un método `async` no cumpliría su contrato.
+# Sentencias y caché compartidas: Las sentencias vienen de `user_statements` y la caché de `user_cache`
+#    (ambos con API pública), así una escritura en cualquiera de los dos adaptadores invalida la misma caché.
+# Unidad de Trabajo: Igual que en la versión síncrona, aquí no se hace commit; lo hace `async_session_scope`.
+#    `save` y `save_if_new` escriben dentro de un SAVEPOINT (`begin_nested`): un fallo no aborta la transacción exterior.
+# Driver: `asyncpg` (protocolo binario) a través de `get_async_sessionmaker` en `database.py`.
+
+# Rol en la Arquitectura
+# Adaptador de infraestructura: Conecta el dominio con PostgreSQL sin bloquear el event loop
+# Traducción entre capas: Convierte entre User (dominio) y UserModel (persistencia)
+# Manejo de transacciones: Delegado a la Unidad de Trabajo asíncrona
@@ -1,11 +1,18 @@
 import os
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Iterator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
 # --- Configuración de Base de Datos ---
 DATABASE_URL = "postgresql://myapp_user:myapp_password@db:5432/myapp_db"  # URL de conexión a PostgreSQL
-engine = create_engine(DATABASE_URL, echo=True)  # Crear el motor de SQLAlchemy
+# Tamaño de la caché LRU de sentencias compiladas del motor. La caché pertenece al engine,
+# así que la comparten todas las sesiones y peticiones (no se recompila el SQL por sesión)
+QUERY_CACHE_SIZE = 1200
+engine = create_engine(DATABASE_URL, echo=True, query_cache_size=QUERY_CACHE_SIZE)  # Crear el motor de SQLAlchemy
 
 # --- Definición centralizada de Base ---
 # Todas las tablas heredarán de esta clase base
@@ -14,18 +21,79 @@ Base = declarative_base()
 # Crear el sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# --- Configuración asíncrona (asyncpg) ---
+# Mismo servidor, driver asíncrono: las esperas de BD no bloquean el event loop
+ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """
+    Motor asíncrono, creado en el primer uso (no al importar el módulo): quien no usa la
+    variante `async` (el worker, las pruebas síncronas) no necesita tener `asyncpg` instalado.
+    """
+    return create_async_engine(ASYNC_DATABASE_URL, echo=True, query_cache_size=QUERY_CACHE_SIZE)
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    """ Fábrica de `AsyncSession` sobre `get_async_engine()`, también perezosa. """
+    # `expire_on_commit=False`: tras el commit no se recargan atributos (en async eso sería I/O implícito)
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
 
 def get_db_session() -> Session:
-    """ Generador que proporciona sesiones de base de datos. """
+    """
+    Generador que proporciona sesiones de base de datos.
+    Actúa como Unidad de Trabajo por petición: un único commit al terminar,
+    rollback si la petición falla.
+    """
     db_session = SessionLocal() # Crear una nueva sesión del pool
     try:
         yield db_session # Permite que FastAPI use la sesión
-
+        db_session.commit() # Un solo commit (y un solo flush de WAL) por petición
+    except Exception:
+        db_session.rollback()
+        raise
     finally:
         # Asegurar que la sesión se cierre siempre
         db_session.close()
 
 
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Unidad de Trabajo fuera de FastAPI (p.ej. workers de RabbitMQ).
+    Hace commit al salir del bloque, rollback si se lanza una excepción y cierra la sesión siempre.
+    """
+    db_session = SessionLocal()
+    try:
+        yield db_session
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        raise
+    finally:
+        db_session.close()
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Unidad de Trabajo asíncrona: equivalente a `session_scope` para código `async`.
+    Hace commit al salir del bloque, rollback si se lanza una excepción y cierra la sesión siempre.
+    """
+    db_session = get_async_sessionmaker()()
+    try:
+        yield db_session
+        await db_session.commit()
+    except Exception:
+        await db_session.rollback()
+        raise
+    finally:
+        await db_session.close()
+
+
 def create_tables():
     """
     Crea todas las tablas definidas en los modelos que heredan de Base.
@@ -47,11 +115,14 @@ def create_tables():
 
 
 # Exportamos elementos importantes para que otros módulos puedan importarlos
-__all__ = ["Base", "engine", "SessionLocal", "get_db_session", "create_tables"]
+__all__ = [
+    "Base", "engine", "SessionLocal", "get_db_session", "session_scope",
+    "get_async_engine", "get_async_sessionmaker", "async_session_scope", "create_tables",
+]
 
 # Rol en la Arquitectura
 # Adaptador de persistencia: Configura conexión con base de datos PostgreSQL
-# Gestión de sesiones: Proporciona mecanismos para manejar transacciones
+# Gestión de sesiones: Proporciona mecanismos para manejar transacciones (Unidad de Trabajo: un commit por petición/mensaje)
 # Configuración centralizada: Única fuente de verdad para conexión a BD
 # Inyección de dependencias: Facilita la inyección de sesiones en endpoints
 # Resiliencia: Configura pool de conexiones para mejor performance
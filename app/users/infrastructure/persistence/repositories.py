@@ -1,13 +1,31 @@
 # PUERTO SECUNDARIO
+import uuid
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Union
 
 # Importamos la interfaz del repositorio del dominio
 from ...domain.repositories import UserRepository # ABSTRACCIÓN
 # Importamos la entidad de dominio
-from ...domain.models import User # MODELO DE DOMINIO
+from ...domain.models import User, UserNotFoundError, UserPersistenceError # MODELO DE DOMINIO
 # Importamos el modelo de SQLAlchemy
 from .user_model import UserModel #ADAPTADOR
+# Sentencias SQL compartidas con el adaptador asíncrono
+from .user_statements import (
+    SELECT_USER_BY_EMAIL,
+    SELECT_USER_BY_ID,
+    delete_user,
+    insert_user_if_new,
+    normalize_user_id,
+    to_domain,
+    update_user,
+)
+# Caché de lecturas coherente con las transacciones
+from .user_cache import (
+    cache_user,
+    evict_user_after_commit,
+    get_cached_user_by_id,
+    read_snapshot,
+)
 
 class SQLAlchemyUserRepository(UserRepository):
     """
@@ -27,9 +45,10 @@ class SQLAlchemyUserRepository(UserRepository):
 
     def save(self, user: User) -> None:
         """
-        Guarda un usuario en la base de datos.
+        Guarda un usuario NUEVO en la base de datos (solo INSERT; para cambios usar `update`).
         IMPLEMENTACIÓN DEL PUERTO SECUNDARIO: Traduce del modelo de dominio al modelo de persistencia.
-        Raises: RuntimeError: Si hay un error al guardar el usuario en la base de datos.
+        No hace commit: la transacción la cierra la Unidad de Trabajo (`session_scope` / `get_db_session`).
+        Raises: UserPersistenceError: Si hay un error al guardar el usuario en la base de datos.
         """
  
         # Traducción entre capas: dominio -> persistencia
@@ -38,82 +57,157 @@ class SQLAlchemyUserRepository(UserRepository):
             name=user.name,
             email=user.email,
             hashed_password=user.hashed_password,
-            # created_at se establece por defecto en el modelo
+            # created_at lo genera la BD (server_default)
         )
         
-        # Agregar el modelo a la sesión de SQLAlchemy
-        self._db_session.add(user_model)
-        
-        # Commit para persistir los cambios en la BD
+        # Agregar el modelo a la sesión dentro de un SAVEPOINT: al salir del bloque se hace flush
+        # (sin commit) para que las violaciones de constraints aparezcan aquí. Si falla, solo se
+        # revierte el SAVEPOINT y la transacción de la Unidad de Trabajo sigue siendo utilizable
+        # (en PostgreSQL un error sin SAVEPOINT deja abortada toda la transacción).
+        try:
+            with self._db_session.begin_nested():
+                self._db_session.add(user_model)
+        except Exception as e:
+            # Relanzar como error tipado; el mensaje es fijo y la causa queda en `__cause__`
+            # (formatear `e` aquí serializaría la sentencia y sus parámetros en cada fallo)
+            raise UserPersistenceError("Error al guardar el usuario en la base de datos.") from e
+
+        # Invalidar cualquier copia cacheada del usuario cuando la transacción haga commit
+        evict_user_after_commit(self._db_session, user.id)
+
+
+    def save_if_new(self, user: User) -> bool:
+        """
+        Inserta el usuario solo si su email no existe, en UN solo viaje a la BD.
+        Usa `INSERT ... ON CONFLICT (email) DO NOTHING RETURNING id` apoyándose en el índice único
+        de email: no hace falta un SELECT previo y es atómico frente a altas concurrentes.
+        Returns: bool: True si se insertó, False si el email ya estaba registrado.
+        Raises: UserPersistenceError: Si hay un error al guardar el usuario en la base de datos.
+                Igual que en `save`, solo se revierte el SAVEPOINT: la sesión sigue utilizable (no hace
+                falta `rollback` antes de la siguiente llamada) y la Unidad de Trabajo decide si confirma.
+        """
+        # `ON CONFLICT (email)` solo cubre el email duplicado: cualquier otro error (PK repetida, NOT NULL...)
+        # abortaría la transacción de la Unidad de Trabajo en PostgreSQL, así que va en un SAVEPOINT como `save`
+        try:
+            with self._db_session.begin_nested():
+                inserted_id = self._db_session.scalar(insert_user_if_new(user))
+        except Exception as e:
+            raise UserPersistenceError("Error al guardar el usuario en la base de datos.") from e
+
+        if inserted_id is None:
+            return False # Conflicto: el email ya existe
+
+        evict_user_after_commit(self._db_session, user.id)
+        return True
+
+
+    def update(self, user: User) -> None:
+        """
+        Actualiza un usuario existente con UN solo `UPDATE ... WHERE id = ?`.
+        No usa `Session.merge`, que emitiría antes un SELECT para comprobar si la fila existe.
+        Raises:
+            UserNotFoundError: Si no existe un usuario con ese ID.
+            UserPersistenceError: Si hay un error al actualizar el usuario en la base de datos.
+        """
         try:
-            self._db_session.commit()
+            result = self._db_session.execute(update_user(user))
         except Exception as e:
-            # Rollback en caso de error
-            self._db_session.rollback()
-            # Relanzar la excepción
-            raise RuntimeError(f"Error al guardar el usuario en la base de datos: {e}") from e
+            raise UserPersistenceError("Error al actualizar el usuario en la base de datos.") from e
 
+        # Ninguna fila afectada: el usuario no existe
+        if result.rowcount == 0:
+            raise UserNotFoundError(f"No existe un usuario con ID '{user.id}'.")
 
-    def get_by_id(self, user_id: str) -> Optional[User]:
+        # Invalidar la copia anterior (también su entrada por email, que pudo cambiar) tras el commit
+        evict_user_after_commit(self._db_session, user.id)
+
+
+    def delete(self, user_id: str) -> bool:
+        """
+        Elimina un usuario por su ID con UN solo `DELETE ... WHERE id = ?` (sin cargar la fila antes).
+        Returns: bool: True si el usuario fue eliminado, False si no se encontró.
+        Raises: UserPersistenceError: Si hay un error al eliminar el usuario de la base de datos.
+        """
+        try:
+            result = self._db_session.execute(delete_user(user_id))
+        except Exception as e:
+            raise UserPersistenceError("Error al eliminar el usuario de la base de datos.") from e
+
+        evict_user_after_commit(self._db_session, user_id)
+        return result.rowcount > 0
+
+
+    def get_by_id(self, user_id: Union[str, uuid.UUID]) -> Optional[User]:
         """
         Obtiene un usuario por su ID desde la base de datos.
         IMPLEMENTACIÓN DEL PUERTO SECUNDARIO: Traduce del modelo de persistencia al modelo de dominio.
+        Acepta el `str` que usa el dominio o un `uuid.UUID` ya validado (p.ej. por la API) sin volver a parsearlo.
         Returns: Optional[User]: La instancia del User del dominio si se encuentra, None en caso contrario.
         """
-        # Buscar el UserModel en la BD usando la sesión de SQLAlchemy
-        user_model: UserModel = self._db_session.query(UserModel).filter(UserModel.id == user_id).first() # UserModel (modelo de persistencia)
+        user_id = normalize_user_id(user_id)
+
+        # Consultar primero la caché: un acierto evita el viaje a la BD
+        cached_user = get_cached_user_by_id(user_id)
+        if cached_user is not None:
+            return cached_user
+
+        snapshot = read_snapshot(self._db_session) # Antes del SELECT (ver `user_cache`)
+        # Buscar el UserModel en la BD reutilizando la sentencia precompilada
+        # `scalar` devuelve directamente el primer UserModel (o None) sin envolverlo en un `Result`
+        user_model: Optional[UserModel] = self._db_session.scalar(
+            SELECT_USER_BY_ID, {"user_id": user_id}
+        ) # UserModel (modelo de persistencia)
 
         # Si no se encuentra, devolver None
         if not user_model:
             return None
 
         # Si se encuentra, traducir el UserModel al User del dominio:  persistencia -> dominio
-        user_domain = User(
-            user_id=str(user_model.id),  # Convertir UUID a str
-            name=user_model.name,
-            email=user_model.email,
-            hashed_password=user_model.hashed_password
-        )
+        user_domain = to_domain(user_model)
 
+        cache_user(user_domain, snapshot)
         return user_domain
 
 
     def get_by_email(self, email: str) -> Optional[User]:
         """
         Obtiene un usuario por su correo electrónico.
+        No usa la caché: es la búsqueda del login y debe ver siempre las credenciales vigentes.
         Returns: Optional[User]: La instancia del User del dominio si se encuentra, None en caso contrario.
         """
-        # Buscar el UserModel en la BD usando la sesión de SQLAlchemy
-        user_model: Optional[UserModel] = self._db_session.query(UserModel).filter(UserModel.email == email).first()
+        # Buscar el UserModel en la BD reutilizando la sentencia precompilada
+        user_model: Optional[UserModel] = self._db_session.scalar(
+            SELECT_USER_BY_EMAIL, {"email": email}
+        )
 
         # Si no se encuentra, devolver None
         if not user_model:
             return None
 
         # Si se encuentra, traducir el UserModel al User del dominio
-        user_domain = User(
-            user_id=str(user_model.id),
-            name=user_model.name,
-            email=user_model.email,
-            hashed_password=user_model.hashed_password
-        )
-
-        return user_domain
+        return to_domain(user_model)
 
 # --- Notas sobre la implementación ---
 # Herencia: `SQLAlchemyUserRepository` hereda de `UserRepository` (del dominio).
 # Inyección de Dependencias: Recibe una `Session` de SQLAlchemy en el constructor.
 # Traducción entre capas:
 #    - `save`: Convierte `User` (dominio) -> `UserModel` (SQLAlchemy) -> BD.
-#    - `get_by_id`: Convierte BD -> `UserModel` (SQLAlchemy) -> `User` (dominio).
-# SQLAlchemy Utiliza la sesión para queries (`query`, `filter`, `first`) y para persistir cambios (`add`, `commit`, `rollback`).
-# Manejo de Excepciones: Captura errores de la BD y los maneja adecuadamente: (rollback, relanzar como excepción de aplicación).
+#    - `save_if_new`: Inserta con `ON CONFLICT DO NOTHING` (PostgreSQL) y devuelve si hubo alta.
+#    - `update`/`delete`: Una sola sentencia `UPDATE`/`DELETE` por ID (sin `merge` ni SELECT previo).
+#    - `get_by_id`: Convierte BD -> `UserModel` (SQLAlchemy) -> `User` (dominio) con `User.from_row` (sin revalidar).
+# SQLAlchemy Utiliza la sesión para queries estilo 2.0 (`lambda_stmt` + `select`, `scalar`) y para persistir cambios (`add`, `flush`).
+#    Las sentencias viven en `user_statements`, compartidas con `AsyncSQLAlchemyUserRepository`.
+# Caché de lecturas: `get_by_id` sirve filas inmutables de `user_cache` (un `User` nuevo en cada acierto); las
+#    escrituras invalidan la entrada solo cuando su transacción hace commit. `get_by_email` (login) no se cachea.
+# Unidad de Trabajo: `save` no hace commit; el commit/rollback ocurre una vez por petición o mensaje.
+#    `save` y `save_if_new` escriben dentro de un SAVEPOINT (`begin_nested`): un fallo no aborta la transacción exterior.
+# Manejo de Excepciones: Captura errores de la BD y los relanza como excepción de dominio (`UserPersistenceError`).
 # Dependencias de Infraestructura: Esta clase DEPENDE de SQLAlchemy y UserModel. El dominio NO debe conocer estas dependencias.
 # Arquitectura Hexagonal: El dominio define la interfaz, la infraestructura la implementa. El dominio usa la abstracción.
 
 # Rol en la Arquitectura
 # Implementación concreta: Adaptador que cumple el contrato UserRepository
 # Traducción entre capas: Convierte entre User (dominio) y UserModel (persistencia)
-# Manejo de transacciones: Commit/rollback para garantizar consistencia
+# Manejo de transacciones: Delegado a la Unidad de Trabajo (un commit por petición/mensaje)
 # Inyección de dependencias: Recibe sesión de BD para facilitar testing
 # Adaptador de infraestructura: Conecta dominio con tecnología específica (SQLAlchemy)
\ No newline at end of file
@@ -0,0 +1,137 @@
+# CACHÉ DE LECTURAS (compartida por los repositorios síncrono y asíncrono)
+import threading
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Any, NamedTuple, Optional
+
+# Importamos la entidad de dominio
+from ...domain.models import User # MODELO DE DOMINIO
+
+# --- Caché de lecturas (en proceso, con TTL) ---
+# Las sesiones se crean por petición (ver `di_container`), por eso la caché vive a nivel de módulo.
+# Solo se cachean usuarios encontrados: un `None` nunca se guarda, así un alta nueva es visible al instante.
+# El TTL acota cuánto tiempo puede servirse un dato que otro proceso (p.ej. el worker) haya modificado:
+# sus invalidaciones no llegan a esta caché.
+# Solo se cachea por ID: la búsqueda por email es la del login y siempre va a la BD, para que un
+# usuario borrado o una contraseña cambiada (por el worker, en otro proceso) no sigan valiendo hasta el TTL.
+USER_CACHE_MAXSIZE = 10_000
+USER_CACHE_TTL_SECONDS = 60
+_users_by_id: TTLCache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL_SECONDS)
+_lock = threading.Lock() # TTLCache no es thread-safe
+
+
+class UserRow(NamedTuple):
+    """
+    Fila inmutable que se guarda en la caché. `User` es mutable (setter de `name`): si se cacheara
+    la entidad, un llamador que la modificara cambiaría lo que reciben todos los demás.
+    """
+    id: str
+    name: str
+    email: str
+    hashed_password: str
+
+
+# Generación de la caché: aumenta cada vez que se aplica una invalidación tras un commit.
+# Una lectura solo se cachea si la generación no cambió desde antes de su SELECT; así un
+# lector concurrente no puede volver a guardar la fila anterior a un commit que ya la invalidó.
+_generation = 0
+
+# Claves en `Session.info` (las comparten `Session` y `AsyncSession`, que delega en su sesión síncrona)
+_PENDING_EVICTIONS = "users_cache_pending_evictions"
+_COMMITTED = "users_cache_committed"
+
+
+def clear_user_cache() -> None:
+    """ Vacía la caché de lecturas de usuarios (útil en tests o tras cambios externos). """
+    global _generation
+    with _lock:
+        _generation += 1
+        _users_by_id.clear()
+
+
+def get_cached_user_by_id(user_id: str) -> Optional[User]:
+    """ Devuelve un `User` NUEVO construido desde la fila cacheada bajo `user_id`, o None si no está. """
+    with _lock:
+        row = _users_by_id.get(user_id)
+    if row is None:
+        return None
+    return User.from_row(user_id=row.id, name=row.name, email=row.email, hashed_password=row.hashed_password)
+
+
+def read_snapshot(session: Any) -> Optional[int]:
+    """
+    Marca el inicio de una lectura cacheable; hay que llamarla ANTES del SELECT.
+    Returns: La generación actual, o None si la sesión tiene escrituras sin confirmar
+             (lo que lea puede no existir nunca para los demás: no se cachea).
+    """
+    if session.info.get(_PENDING_EVICTIONS):
+        return None
+    return _generation
+
+
+def cache_user(user: User, snapshot: Optional[int]) -> None:
+    """ Guarda el usuario leído si la lectura es cacheable y nada se invalidó desde `snapshot`. """
+    if snapshot is None:
+        return
+    row = UserRow(user.id, user.name, user.email, user.hashed_password)
+    with _lock:
+        if snapshot == _generation:
+            _users_by_id[user.id] = row
+
+
+def evict_user_after_commit(session: Any, user_id: str) -> None:
+    """
+    Registra que la transacción de `session` escribió al usuario `user_id`.
+    La entrada se invalida solo cuando esa transacción hace commit; si se revierte, no pasa nada
+    (la caché nunca llegó a ver el cambio). Mientras tanto, las lecturas de esa sesión no se cachean.
+    """
+    session.info.setdefault(_PENDING_EVICTIONS, set()).add(user_id)
+
+
+def _apply_evictions(user_ids: set) -> None:
+    """ Invalida las entradas de los usuarios escritos y avanza la generación. """
+    global _generation
+    with _lock:
+        _generation += 1
+        for user_id in user_ids:
+            _users_by_id.pop(user_id, None)
+
+
+# --- Enganche con el ciclo de vida de la transacción ---
+# `after_commit` también se emite al liberar un SAVEPOINT, por eso solo se anota el commit y la
+# decisión se toma en `after_transaction_end` de la transacción raíz (commit real o rollback/close).
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session: Session) -> None:
+    session.info[_COMMITTED] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _on_transaction_end(session: Session, transaction) -> None:
+    committed = session.info.pop(_COMMITTED, False)
+    if transaction.parent is not None:
+        return # SAVEPOINT o subtransacción: la raíz decide
+    pending = session.info.pop(_PENDING_EVICTIONS, None)
+    if committed and pending:
+        _apply_evictions(pending)
+
+
+__all__ = [
+    "USER_CACHE_MAXSIZE", "USER_CACHE_TTL_SECONDS", "UserRow", "clear_user_cache",
+    "get_cached_user_by_id",
+    "read_snapshot", "cache_user", "evict_user_after_commit",
+]
+
+# --- Notas sobre la implementación ---
+# Coherencia con la transacción: Las escrituras no tocan la caché hasta que su transacción hace commit;
+#    un rollback descarta las invalidaciones pendientes y no deja nada cacheado.
+# Lecturas: Solo se cachean desde sesiones sin escrituras pendientes (leen datos ya confirmados,
+#    asumiendo READ COMMITTED, el nivel por defecto de PostgreSQL) y si la generación no cambió.
+# Inmutabilidad: Se guardan tuplas `UserRow`; cada acierto devuelve un `User` nuevo.
+# Ámbito: Caché por proceso. Lo que escribe otro proceso (worker) solo se refleja al expirar el TTL
+#    (máx. `USER_CACHE_TTL_SECONDS` para `get_by_id`); las credenciales (`get_by_email`) no se cachean.
+
+# Rol en la Arquitectura
+# Adaptador de infraestructura: Optimización de lecturas, invisible para el dominio y la aplicación
+# Compartida: La usan `SQLAlchemyUserRepository` y `AsyncSQLAlchemyUserRepository`
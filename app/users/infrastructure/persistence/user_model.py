@@ -1,7 +1,5 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
-from datetime import datetime
-import uuid
 
 # --- Importar Base desde database.py ---
 # Usamos la MISMA Base definida en database.py
@@ -17,12 +15,31 @@ class UserModel(Base):
     # Nombre de la tabla en la base de datos
     __tablename__ = 'users'
 
+    # Índice único "covering" sobre email: el login (`WHERE email = ?`) se resuelve con un
+    # index-only scan porque id, name y hashed_password viajan en la hoja del índice.
+    # Sustituye al índice/unique de la columna para no duplicar índices sobre email.
+    # Tras cargar datos existentes conviene un `VACUUM` para que el visibility map permita index-only scans.
+    __table_args__ = (
+        Index(
+            "ix_users_email_covering",
+            "email",
+            unique=True,
+            postgresql_include=["id", "name", "hashed_password"],
+        ),
+    )
+
+    # `created_at` no se lee tras el INSERT: evitamos que SQLAlchemy lo recupere con RETURNING
+    __mapper_args__ = {"eager_defaults": False}
+
     # Columnas de la tabla
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # `as_uuid=False`: el driver devuelve el UUID como `str`, el mismo tipo que usa el dominio
+    # Sin default en Python: el ID lo genera el handler; si un INSERT lo omite, lo genera PostgreSQL
+    # (`gen_random_uuid()` es nativa desde PostgreSQL 13, sin extensión pgcrypto)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
     name = Column(String(255), nullable=False)
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    email = Column(String(255), nullable=False) # Unicidad e índice: ver `ix_users_email_covering`
     hashed_password = Column(String(255), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False) # Lo genera la BD en el INSERT
 
     def __repr__(self):
         """
@@ -39,5 +56,5 @@ class UserModel(Base):
 # Modelo de persistencia: Adaptador que mapea entidades de dominio a tablas
 # Sin lógica de negocio: Solo estructura y constraints de la base de datos
 # Tipos específicos: Utiliza UUID, DateTime y otros tipos de PostgreSQL
-# Índices y constraints: Optimiza búsquedas y garantiza integridad
+# Índices y constraints: Optimiza búsquedas (índice covering por email) y garantiza integridad
 # Adaptador de infraestructura: Conecta dominio con base de datos relacional
\ No newline at end of file
@@ -0,0 +1,90 @@
+# SENTENCIAS SQL DEL REPOSITORIO DE USUARIOS (compartidas por los adaptadores síncrono y asíncrono)
+import uuid
+from sqlalchemy import bindparam, delete, lambda_stmt, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only, raiseload
+from typing import Union
+
+# Importamos la entidad de dominio
+from ...domain.models import User # MODELO DE DOMINIO
+# Importamos el modelo de SQLAlchemy
+from .user_model import UserModel #ADAPTADOR
+
+# --- Sentencias precompiladas ---
+# `lambda_stmt` permite a SQLAlchemy analizar la lambda una sola vez y reutilizar
+# la sentencia compilada en cada llamada; el valor buscado viaja como `bindparam`.
+# `load_only` limita el SELECT a las columnas que necesita la entidad `User` (se omite `created_at`).
+# `raiseload`: cualquier carga perezosa accidental (columna omitida o futura relación) lanza un error
+# en lugar de emitir SELECTs extra en silencio (N+1).
+SELECT_USER_BY_ID = lambda_stmt(
+    lambda: select(UserModel)
+    .options(
+        load_only(UserModel.id, UserModel.name, UserModel.email, UserModel.hashed_password, raiseload=True),
+        raiseload("*"),
+    )
+    .where(UserModel.id == bindparam("user_id"))
+)
+SELECT_USER_BY_EMAIL = lambda_stmt(
+    lambda: select(UserModel)
+    .options(
+        load_only(UserModel.id, UserModel.name, UserModel.email, UserModel.hashed_password, raiseload=True),
+        raiseload("*"),
+    )
+    .where(UserModel.email == bindparam("email"))
+)
+
+
+def insert_user_if_new(user: User):
+    """ `INSERT ... ON CONFLICT (email) DO NOTHING RETURNING id`: devuelve el id solo si hubo alta. """
+    return (
+        pg_insert(UserModel)
+        .values(id=user.id, name=user.name, email=user.email, hashed_password=user.hashed_password)
+        .on_conflict_do_nothing(index_elements=[UserModel.email])
+        .returning(UserModel.id)
+    )
+
+
+def update_user(user: User):
+    """ Un solo `UPDATE ... WHERE id = ?` (sin `Session.merge`, que haría antes un SELECT). """
+    return (
+        update(UserModel)
+        .where(UserModel.id == user.id)
+        .values(name=user.name, email=user.email, hashed_password=user.hashed_password)
+    )
+
+
+def delete_user(user_id: str):
+    """ Un solo `DELETE ... WHERE id = ?` (sin cargar la fila antes). """
+    return delete(UserModel).where(UserModel.id == user_id)
+
+
+def normalize_user_id(user_id: Union[str, uuid.UUID]) -> str:
+    """ La columna es `UUID(as_uuid=False)` y la caché usa la forma canónica en texto. """
+    if isinstance(user_id, uuid.UUID):
+        return str(user_id)
+    return user_id
+
+
+def to_domain(user_model: UserModel) -> User:
+    """ Traduce persistencia -> dominio con `User.from_row` (la fila ya fue validada al guardarse). """
+    return User.from_row(
+        user_id=user_model.id,  # Ya es `str` (UUID(as_uuid=False))
+        name=user_model.name,
+        email=user_model.email,
+        hashed_password=user_model.hashed_password
+    )
+
+
+__all__ = [
+    "SELECT_USER_BY_ID", "SELECT_USER_BY_EMAIL", "insert_user_if_new", "update_user",
+    "delete_user", "normalize_user_id", "to_domain",
+]
+
+# --- Notas sobre la implementación ---
+# Sin sesión: Este módulo solo construye sentencias; ejecutarlas (`Session` o `AsyncSession`) es cosa de cada adaptador.
+# Una sola definición: Ambos repositorios comparten las mismas sentencias, así no divergen al cambiar el esquema.
+# `pg_insert` en SQLite: `ON CONFLICT DO NOTHING` y `RETURNING` también compilan en SQLite (las pruebas lo usan).
+
+# Rol en la Arquitectura
+# Adaptador de infraestructura: SQL del contexto 'users', invisible para el dominio y la aplicación
+# Compartido: Lo usan `SQLAlchemyUserRepository` y `AsyncSQLAlchemyUserRepository`
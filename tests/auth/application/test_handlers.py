@@ -4,8 +4,10 @@ Pruebas unitarias para los handlers de aplicación del contexto 'auth'.
 Estas pruebas validan la lógica de los casos de uso, aislando las dependencias
 (mockeando repositorios, usuarios y funciones auxiliares).
 """
+import re
 import pytest
-from unittest.mock import Mock
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 from datetime import datetime, timedelta, timezone
 
 # Importamos los comandos y queries
@@ -23,166 +25,113 @@ from app.auth.application.commands.handlers import (
 # Importamos el handler de validación (consulta) desde queries.handlers
 from app.auth.application.queries.handlers import handle_validate_token
 
-# Importamos modelos de dominio y repositorios (para tipos y mocks)
+# Importamos modelos de dominio (los mocks de repositorios están en conftest.py)
 from app.users.domain.models import User
-from app.users.domain.repositories import UserRepository
 from app.auth.domain.models import Token
-from app.auth.domain.repositories import TokenRepository
+
+# Marcas de tiempo fijas del módulo (aware en UTC, igual que la app)
+_NOW = datetime.now(timezone.utc)
+_FUTURE = _NOW + timedelta(hours=1)
+
+# Mensajes esperados precompilados (pytest.raises acepta un patrón ya compilado)
+_CREDS_RE = re.compile("Credenciales inválidas.")
+_VALIDATE_ERROR_RE = re.compile("Error al validar el token: DB Error")
 
 # --- Mocks para funciones auxiliares (simulando implementaciones reales) ---
-def mock_verify_password(plain: str, hashed: str) -> bool:
-    return hashed == "correct_hashed_password"
+_EXPECTED_TOKEN = "generated_test_token_abc123"
 
 def mock_generate_token() -> str:
-    return "generated_test_token_abc123"
+    return _EXPECTED_TOKEN
 
 def mock_calculate_expires(hours: int) -> datetime:
-    return datetime.now(timezone.utc) + timedelta(hours=hours)
+    return _NOW + timedelta(hours=hours) # Con hours=1 es exactamente _FUTURE
 
-# --- Función auxiliar para crear mocks compatibles ---
-def create_user_repo_mock_with_get_by_email():
-    """Crea un mock de UserRepository y le añade el método get_by_email."""
-    mock_repo = Mock(spec=UserRepository) # Crea el mock con la spec
-    # Añade explícitamente el método get_by_email que necesitamos simular
-    mock_repo.get_by_email = Mock()
-    return mock_repo
+# Los mocks de repositorios (`user_repo_mock`, `token_repo_mock`) vienen de conftest.py:
+# se construyen una vez y se resetean al terminar cada prueba.
 
 # --- Pruebas para handle_login_user ---
 
-def test_handle_login_user_success():
-    """Prueba el login exitoso de un usuario."""
+_LOGIN_USER = User("user-123", "Test User", "user@example.com", "correct_hashed_password")
+
+@pytest.mark.parametrize("user, password_ok, should_raise", [
+    pytest.param(_LOGIN_USER, True, False, id="success"),
+    pytest.param(None, True, True, id="no_user"),
+    pytest.param(_LOGIN_USER, False, True, id="wrong_pwd"),
+])
+def test_handle_login_user(user, password_ok, should_raise, user_repo_mock, token_repo_mock):
+    """Prueba el login: éxito, usuario inexistente y contraseña incorrecta."""
     # 1. Arrange
     command = LoginCommand(email="user@example.com", password="secret")
-
-    mock_user = User("user-123", "Test User", "user@example.com", "correct_hashed_password")
-    
-    mock_user_repo = create_user_repo_mock_with_get_by_email()
-    mock_user_repo.get_by_email.return_value = mock_user
-    
-    mock_token_repo = Mock(spec=TokenRepository)
-    mock_token_repo.save.return_value = None
-
-    # 2. Act
-    access_token_result = handle_login_user(
-        command,
-        mock_user_repo,
-        mock_token_repo,
-        mock_verify_password,
-        mock_generate_token,
-        mock_calculate_expires
-    )
-
-    # 3. Assert
-    mock_user_repo.get_by_email.assert_called_once_with(command.email)
-    mock_token_repo.save.assert_called_once()
-    
-    saved_token_arg = mock_token_repo.save.call_args[0][0] # Primer argumento posicional
-    assert isinstance(saved_token_arg, Token)
-    assert saved_token_arg.user_id == mock_user.id
-    assert saved_token_arg.access_token == mock_generate_token()
-    expected_expires = mock_calculate_expires(1)
-    assert abs((saved_token_arg.expires_at - expected_expires).total_seconds()) < 2
-    
-    assert access_token_result == mock_generate_token()
-
-def test_handle_login_user_invalid_credentials_user_not_found():
-    """Prueba login con credenciales inválidas (usuario no encontrado)."""
-    command = LoginCommand(email="nonexistent@example.com", password="any_password")
-    
-    mock_user_repo = create_user_repo_mock_with_get_by_email()
-    mock_user_repo.get_by_email.return_value = None
-    
-    mock_token_repo = Mock(spec=TokenRepository)
-
-    with pytest.raises(ValueError, match="Credenciales inválidas."):
-        handle_login_user(
-            command,
-            mock_user_repo,
-            mock_token_repo,
-            mock_verify_password,
-            mock_generate_token,
-            mock_calculate_expires
+    user_repo_mock.get_by_email.return_value = user
+    # Mock controlado para poder verificar con qué argumentos se llamó
+    verify_password_fn = MagicMock(return_value=password_ok)
+
+    # 2. Act / 3. Assert
+    if should_raise:
+        with pytest.raises(ValueError, match=_CREDS_RE):
+            handle_login_user(
+                command, user_repo_mock, token_repo_mock,
+                verify_password_fn, mock_generate_token, mock_calculate_expires
+            )
+        token_repo_mock.save.assert_not_called()
+    else:
+        access_token_result = handle_login_user(
+            command, user_repo_mock, token_repo_mock,
+            verify_password_fn, mock_generate_token, mock_calculate_expires
         )
-    
-    mock_user_repo.get_by_email.assert_called_once_with(command.email)
-    mock_token_repo.save.assert_not_called()
-
-def test_handle_login_user_invalid_credentials_wrong_password():
-    """Prueba login con credenciales inválidas (contraseña incorrecta)."""
-    command = LoginCommand(email="user@example.com", password="wrong_password")
-
-    # Creamos el usuario mock con la contraseña hasheada correcta
-    mock_user = User("user-123", "Test User", "user@example.com", "correct_hashed_password")
-    mock_user_repo = create_user_repo_mock_with_get_by_email()
-    mock_user_repo.get_by_email.return_value = mock_user
-
-    mock_token_repo = Mock(spec=TokenRepository)
-
-    # Llamamos al handler
-    # NO esperamos que lance una excepcion aqui, solo queremos verificar la llamada a verify_password_fn
-    # Para eso, mockeamos verify_password_fn directamente en la llamada al handler
-    from unittest.mock import MagicMock
-    mock_verify_password_fn = MagicMock()
-    # Configuramos el mock para que devuelva False, simulando una contraseña incorrecta
-    mock_verify_password_fn.return_value = False
-
-    # Ahora llamamos al handler con nuestro mock
-    with pytest.raises(ValueError, match="Credenciales inválidas."):
-        handle_login_user(
-            command,
-            mock_user_repo,
-            mock_token_repo,
-            mock_verify_password_fn, # <-- Usamos nuestro mock controlado
-            mock_generate_token,
-            mock_calculate_expires
-        )
-
-    # Aserciones adicionales para verificar que se llamó correctamente
-    mock_user_repo.get_by_email.assert_called_once_with(command.email)
-    # Verificamos que nuestra funcion mock haya sido llamada con los argumentos correctos
-    mock_verify_password_fn.assert_called_once_with(command.password, mock_user.hashed_password)
-    mock_token_repo.save.assert_not_called()
+        token_repo_mock.save.assert_called_once()
+        saved_token_arg = token_repo_mock.save.call_args.args[0] # Primer argumento posicional
+        assert isinstance(saved_token_arg, Token)
+        assert saved_token_arg.user_id == user.id
+        assert saved_token_arg.access_token == _EXPECTED_TOKEN
+        assert saved_token_arg.expires_at == _FUTURE
+        assert access_token_result == _EXPECTED_TOKEN
+
+    user_repo_mock.get_by_email.assert_called_once_with(command.email)
+    # Sin usuario no se llega a verificar la contraseña
+    if user is None:
+        verify_password_fn.assert_not_called()
+    else:
+        verify_password_fn.assert_called_once_with(command.password, user.hashed_password)
 
 # --- Pruebas para handle_validate_token ---
 
-def test_handle_validate_token_success_valid():
-    """Prueba la validación exitosa de un token válido."""
-    # 1. Arrange
+# El handler solo usa duck typing (`user_id`, `expires_at`, `is_expired()`): no hace falta
+# pasar por las validaciones del constructor de Token
+_VALID_TOKEN = SimpleNamespace(
+    token_id="token-789",
+    user_id="user-123",
+    access_token="valid_test_token",
+    expires_at=_FUTURE, # No expirado
+    is_expired=lambda: False,
+)
+
+# El constructor de Token rechaza fechas pasadas, así que el token expirado también se simula
+_EXPIRED_TOKEN = SimpleNamespace(user_id="user-123", expires_at=_NOW, is_expired=lambda: True)
+
+@pytest.mark.parametrize("found_token, expected_result", [
+    pytest.param(
+        _VALID_TOKEN,
+        {"is_valid": True, "user_id": "user-123", "expires_at": _VALID_TOKEN.expires_at.isoformat()},
+        id="valid",
+    ),
+    pytest.param(_EXPIRED_TOKEN, None, id="expired"),
+    pytest.param(None, None, id="not_found"),
+])
+def test_handle_validate_token(found_token, expected_result, token_repo_mock):
+    """Prueba la validación de un token válido, expirado e inexistente."""
     query = ValidateTokenQuery(access_token="valid_test_token")
-    
-    mock_token = Token(
-        token_id="token-789",
-        user_id="user-123",
-        access_token=query.access_token,
-        expires_at= datetime.now(timezone.utc) + timedelta(hours=1) # No expirado
-    )
-    
-    mock_token_repo = Mock(spec=TokenRepository)
-    mock_token_repo.find_by_access_token.return_value = mock_token
-
-    # 2. Act
-    result = handle_validate_token(query, mock_token_repo)
-
-    # 3. Assert
-    mock_token_repo.find_by_access_token.assert_called_once_with(query.access_token)
-    
-    assert result is not None
-    assert result["is_valid"] is True
-    assert result["user_id"] == mock_token.user_id
-    assert result["expires_at"] == mock_token.expires_at.isoformat()
-
-def test_handle_validate_token_not_found():
-    """Prueba la validación de un token que no existe."""
-    query = ValidateTokenQuery(access_token="nonexistent_token")
-    
-    mock_token_repo = Mock(spec=TokenRepository)
-    mock_token_repo.find_by_access_token.return_value = None
-
-    result = handle_validate_token(query, mock_token_repo)
-
-    mock_token_repo.find_by_access_token.assert_called_once_with(query.access_token)
-    assert result is None
-
-# Nota: Probar un token expirado directamente es complejo con el constructor actual de Token.
-# La lógica de Token.is_expired() se prueba en tests/auth/domain/test_models.py.
-# Esta prueba se omite para evitar fragilidad.
+    token_repo_mock.find_by_access_token.return_value = found_token
+
+    result = handle_validate_token(query, token_repo_mock)
+
+    token_repo_mock.find_by_access_token.assert_called_once_with(query.access_token)
+    assert result == expected_result
+
+def test_handle_validate_token_repository_error(token_repo_mock):
+    """Prueba que un error del repositorio se relance como RuntimeError."""
+    query = ValidateTokenQuery(access_token="valid_test_token")
+    token_repo_mock.find_by_access_token.side_effect = Exception("DB Error")
+
+    with pytest.raises(RuntimeError, match=_VALIDATE_ERROR_RE):
+        handle_validate_token(query, token_repo_mock)
@@ -1,17 +1,29 @@
 # tests/auth/domain/test_models.py
+import re
 import pytest
 # Importamos timezone para ser consistentes con la app
 from datetime import datetime, timedelta, timezone
 
 from app.auth.domain.models import Token
 
+# Marcas de tiempo fijas del módulo (aware en UTC, igual que la app): se calcula el reloj una sola vez
+_NOW = datetime.now(timezone.utc)
+_FUTURE = _NOW + timedelta(hours=1)
+_PAST = _NOW - timedelta(hours=1)
+
+# Mensajes esperados precompilados (pytest.raises acepta un patrón ya compilado)
+_MISSING_FIELDS_RE = re.compile("Todos los campos del token son obligatorios.")
+_EXPIRED_RE = re.compile("La fecha de expiración debe ser futura.")
+
+# Datos de token compartidos por todas las pruebas del módulo
+_TOKEN_ID = "123e4567-e89b-12d3-a456-426614174000"
+_USER_ID = "user-123"
+_ACCESS_TOKEN = "abc123xyz"
+
 def test_token_creation_valid():
     """Prueba la creación exitosa de un token con datos válidos."""
-    token_id = "123e4567-e89b-12d3-a456-426614174000"
-    user_id = "user-123"
-    access_token = "abc123xyz"
-    # Usamos datetime.now(timezone.utc) para ser consistentes con la app
-    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    token_id, user_id, access_token = _TOKEN_ID, _USER_ID, _ACCESS_TOKEN
+    expires_at = _FUTURE
 
     token = Token(token_id, user_id, access_token, expires_at)
 
@@ -21,44 +33,29 @@ def test_token_creation_valid():
     # Verificamos que la fecha almacenada sea la misma (o muy cercana)
     assert token.expires_at == expires_at
 
-def test_token_creation_invalid_missing_fields():
-    """Prueba que se lance ValueError si faltan campos requeridos."""
-    token_id = "123e4567-e89b-12d3-a456-426614174000"
-    user_id = "user-123"
-    access_token = "abc123xyz"
-    # Usamos datetime.now(timezone.utc)
-    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
-
-    with pytest.raises(ValueError, match="Todos los campos del token son obligatorios."):
-        Token("", user_id, access_token, expires_at) # ID vacío
-
-    with pytest.raises(ValueError, match="Todos los campos del token son obligatorios."):
-        Token(token_id, "", access_token, expires_at) # user_id vacío
-
-    with pytest.raises(ValueError, match="Todos los campos del token son obligatorios."):
-        Token(token_id, user_id, "", expires_at) # access_token vacío
-
-    with pytest.raises(ValueError, match="Todos los campos del token son obligatorios."):
-        Token(token_id, user_id, access_token, None) # expires_at None
+@pytest.mark.parametrize("token_id, user_id, access_token, expires_at", [
+    pytest.param("", _USER_ID, _ACCESS_TOKEN, _FUTURE, id="id_vacio"),
+    pytest.param(_TOKEN_ID, "", _ACCESS_TOKEN, _FUTURE, id="user_id_vacio"),
+    pytest.param(_TOKEN_ID, _USER_ID, "", _FUTURE, id="access_token_vacio"),
+    pytest.param(_TOKEN_ID, _USER_ID, _ACCESS_TOKEN, None, id="expires_at_none"),
+])
+def test_token_creation_invalid_missing_fields(token_id, user_id, access_token, expires_at):
+    """Prueba que se lance ValueError si falta cualquiera de los campos requeridos."""
+    with pytest.raises(ValueError, match=_MISSING_FIELDS_RE):
+        Token(token_id, user_id, access_token, expires_at)
 
 def test_token_creation_invalid_expired():
     """Prueba que se lance ValueError si la fecha de expiración es pasada."""
-    token_id = "123e4567-e89b-12d3-a456-426614174000"
-    user_id = "user-123"
-    access_token = "abc123xyz"
-    # Crear una fecha en el pasado usando datetime.now(timezone.utc)
-    expired_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    token_id, user_id, access_token = _TOKEN_ID, _USER_ID, _ACCESS_TOKEN
+    expired_at = _PAST
 
-    with pytest.raises(ValueError, match="La fecha de expiración debe ser futura."):
+    with pytest.raises(ValueError, match=_EXPIRED_RE):
         Token(token_id, user_id, access_token, expired_at)
 
 def test_token_is_expired_false():
     """Prueba que is_expired devuelve False para un token no expirado."""
-    token_id = "123e4567-e89b-12d3-a456-426614174000"
-    user_id = "user-123"
-    access_token = "abc123xyz"
-    # Crear una fecha en el futuro usando datetime.now(timezone.utc)
-    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    token_id, user_id, access_token = _TOKEN_ID, _USER_ID, _ACCESS_TOKEN
+    expires_at = _FUTURE
     
     token = Token(token_id, user_id, access_token, expires_at)
     
@@ -72,14 +69,11 @@ def test_token_is_expired_false():
 
 def test_token_equality():
     """Prueba la igualdad de tokens basada en ID."""
-    token_id = "123e4567-e89b-12d3-a456-426614174000"
-    user_id = "user-123"
-    access_token = "abc123xyz"
-    # Usamos datetime.now(timezone.utc)
-    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    token_id, user_id, access_token = _TOKEN_ID, _USER_ID, _ACCESS_TOKEN
+    expires_at = _FUTURE
     
     token1 = Token(token_id, user_id, access_token, expires_at)
-    token2 = Token(token_id, "different-user", "different-token", datetime.now(timezone.utc) + timedelta(hours=2))
+    token2 = Token(token_id, "different-user", "different-token", _FUTURE + timedelta(hours=1))
     token3 = Token("different-id", user_id, access_token, expires_at)
     
     assert token1 == token2 # Mismo ID
@@ -88,11 +82,8 @@ def test_token_equality():
 
 def test_token_repr():
     """Prueba la representación en string del token."""
-    token_id = "123e4567-e89b-12d3-a456-426614174000"
-    user_id = "user-123"
-    access_token = "abc123xyz"
-    # Usamos datetime.now(timezone.utc)
-    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    token_id, user_id, access_token = _TOKEN_ID, _USER_ID, _ACCESS_TOKEN
+    expires_at = _FUTURE
     
     token = Token(token_id, user_id, access_token, expires_at)
     repr_str = repr(token)
@@ -9,34 +9,55 @@ from app.auth.domain.models import Token
 # Importamos la interfaz a probar
 from app.auth.domain.repositories import TokenRepository
 
+# Marcas de tiempo fijas del módulo (aware en UTC, igual que la app)
+_NOW = datetime.now(timezone.utc)
+_FUTURE = _NOW + timedelta(hours=1)
+
 # --- Mock simple que implementa TokenRepository ---
 class MockTokenRepository(TokenRepository):
     def __init__(self):
         self._tokens = {}
+        self._by_access = {} # Índice secundario access_token -> Token (búsqueda O(1))
 
     def save(self, token: Token) -> None:
         self._tokens[token.id] = token
+        self._by_access[token.access_token] = token
 
     def find_by_access_token(self, access_token: str) -> Optional[Token]:
-        # Buscar por access_token en el diccionario
-        for t in self._tokens.values():
-            if t.access_token == access_token:
-                return t
-        return None
+        return self._by_access.get(access_token)
 
     def delete(self, token_id: str) -> bool:
-        if token_id in self._tokens:
-            del self._tokens[token_id]
-            return True
-        return False
+        token = self._tokens.pop(token_id, None)
+        if token is None:
+            return False
+        self._by_access.pop(token.access_token, None)
+        return True
+
+    def clear(self) -> None:
+        """Vacía el almacenamiento y su índice (lo usa la fixture `repo`)."""
+        self._tokens.clear()
+        self._by_access.clear()
+
+# --- Fixtures ---
+@pytest.fixture(scope="module")
+def _shared_repo():
+    """Una sola instancia de MockTokenRepository para todo el módulo."""
+    return MockTokenRepository()
+
+@pytest.fixture
+def repo(_shared_repo):
+    """Repositorio vacío para cada prueba: se reutiliza la instancia y se vacía al terminar."""
+    yield _shared_repo
+    _shared_repo.clear()
+
+@pytest.fixture(scope="module")
+def token():
+    """Token válido compartido (es inmutable, no hace falta uno por prueba)."""
+    return Token("123", "user1", "access123", _FUTURE)
 
 # --- Pruebas para el contrato TokenRepository ---
-def test_token_repository_save_and_find_by_access_token():
+def test_token_repository_save_and_find_by_access_token(repo, token):
     """Prueba save y find_by_access_token."""
-    repo = MockTokenRepository()
-    # Usamos datetime.now(timezone.utc) para ser consistentes con la app
-    token = Token("123", "user1", "access123", datetime.now(timezone.utc) + timedelta(hours=1))
-
     repo.save(token)
     found_token = repo.find_by_access_token("access123")
 
@@ -46,26 +67,21 @@ def test_token_repository_save_and_find_by_access_token():
     assert found_token.user_id == "user1"
     assert found_token.access_token == "access123"
 
-def test_token_repository_find_by_access_token_not_found():
+def test_token_repository_find_by_access_token_not_found(repo):
     """Prueba find_by_access_token devuelve None si no se encuentra."""
-    repo = MockTokenRepository()
     found_token = repo.find_by_access_token("non-existent-token")
     assert found_token is None
 
-def test_token_repository_delete_success():
+def test_token_repository_delete_success(repo, token):
     """Prueba delete devuelve True si se elimina."""
-    repo = MockTokenRepository()
-    # Usamos datetime.now(timezone.utc) para ser consistentes con la app
-    token = Token("123", "user1", "access123", datetime.now(timezone.utc) + timedelta(hours=1))
     repo.save(token)
 
     result = repo.delete("123")
     assert result is True
     assert repo.find_by_access_token("access123") is None
 
-def test_token_repository_delete_not_found():
+def test_token_repository_delete_not_found(repo):
     """Prueba delete devuelve False si no se encuentra."""
-    repo = MockTokenRepository()
     result = repo.delete("non-existent-id")
     assert result is False
 
@@ -76,15 +92,5 @@ def test_token_repository_is_abstract():
     with pytest.raises(TypeError):
         TokenRepository() # type: ignore
 
-    # Verificar que los métodos sean abstractos
-    assert hasattr(TokenRepository, 'save')
-    assert hasattr(TokenRepository.save, '__isabstractmethod__')
-    assert TokenRepository.save.__isabstractmethod__ is True # type: ignore
-    
-    assert hasattr(TokenRepository, 'find_by_access_token')
-    assert hasattr(TokenRepository.find_by_access_token, '__isabstractmethod__')
-    assert TokenRepository.find_by_access_token.__isabstractmethod__ is True # type: ignore
-
-    assert hasattr(TokenRepository, 'delete')
-    assert hasattr(TokenRepository.delete, '__isabstractmethod__')
-    assert TokenRepository.delete.__isabstractmethod__ is True # type: ignore
+    # Verificar que los métodos sean abstractos: ABCMeta mantiene el conjunto en `__abstractmethods__`
+    assert TokenRepository.__abstractmethods__ == frozenset({"save", "find_by_access_token", "delete"})
@@ -0,0 +1,58 @@
+# tests/auth/infrastructure/persistence/test_repositories.py
+"""
+Pruebas de integración del adaptador SQLAlchemyTokenRepository contra una base de datos real.
+El motor, el esquema y la sesión aislada por prueba (`test_db_session`) vienen de tests/conftest.py.
+"""
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.auth.infrastructure.persistence.repositories import SQLAlchemyTokenRepository
+from app.auth.domain.models import Token
+
+_FUTURE = datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+def _new_token(access_token: str = "access-token-123") -> Token:
+    """Crea un Token de dominio válido con IDs únicos."""
+    return Token(str(uuid.uuid4()), str(uuid.uuid4()), access_token, _FUTURE)
+
+
+# --- Pruebas ---
+
+@pytest.mark.parametrize("insert_token, lookup, expect_found", [
+    pytest.param("token_para_busqueda_exitosa", "token_para_busqueda_exitosa", True, id="found"),
+    pytest.param("token_guardado", "token_que_no_existe", False, id="not_found"),
+])
+def test_find_by_access_token(test_db_session, insert_token, lookup, expect_found):
+    """Prueba que un token guardado se recupere por su access_token y que uno inexistente dé None."""
+    repo = SQLAlchemyTokenRepository(test_db_session)
+    token = _new_token(insert_token)
+
+    repo.save(token)
+    found_token = repo.find_by_access_token(lookup)
+
+    if not expect_found:
+        assert found_token is None
+        return
+    assert found_token == token
+    assert found_token.user_id == token.user_id
+    assert found_token.expires_at == token.expires_at
+
+def test_delete(test_db_session):
+    """Prueba que delete elimine el token y devuelva False si ya no existe."""
+    repo = SQLAlchemyTokenRepository(test_db_session)
+    token = _new_token()
+    repo.save(token)
+
+    assert repo.delete(token.id) is True
+    assert repo.find_by_access_token(token.access_token) is None
+    assert repo.delete(token.id) is False
+
+def test_repository_commit_stays_inside_outer_transaction(test_db_session):
+    """Prueba que el commit del repositorio solo libera el SAVEPOINT: la transacción externa sigue abierta."""
+    repo = SQLAlchemyTokenRepository(test_db_session)
+    repo.save(_new_token("access-token-commit"))
+
+    assert test_db_session.in_nested_transaction() # Se reabrió el SAVEPOINT
+    assert test_db_session.connection().in_transaction() # Lo revierte el teardown de la fixture
@@ -0,0 +1,14 @@
+# tests/users/application/conftest.py
+"""
+Fixtures compartidas por las pruebas de handlers del contexto 'users'.
+El mock de UserRepository (`user_repo_mock`) viene de tests/conftest.py.
+"""
+import pytest
+
+from app.users.application.commands.create_user_command import CreateUserCommand
+
+
+@pytest.fixture
+def valid_command() -> CreateUserCommand:
+    """Comando de creación con datos válidos y sin `user_id` (lo genera el handler)."""
+    return CreateUserCommand(name="Juan Pérez", email="juan.perez@example.com", password="UnaContraseñaSegura123!")
@@ -5,21 +5,77 @@ Estas pruebas validan la lógica de los casos de uso, aislando las dependencias
 (mockeando repositorios y funciones auxiliares).
 """
 import pytest
-from unittest.mock import Mock
 
 # Importamos los comandos y queries
+from app.users.application.commands.create_user_command import CreateUserCommand
 from app.users.application.queries.get_user_query import GetUserQuery
 
 # Importamos los handlers a probar
+from app.users.application.commands.handlers import handle_create_user
 from app.users.application.queries.handlers import handle_get_user
 
-# Importamos el modelo de dominio y el repositorio (para tipos y mocks)
+# Importamos el modelo de dominio (el mock del repositorio está en conftest.py)
 from app.users.domain.models import User
-from app.users.domain.repositories import UserRepository
+
+# --- Pruebas para handle_create_user ---
+
+def test_handle_create_user_success(valid_command, user_repo_mock):
+    """Prueba la creación exitosa de un usuario (una sola escritura atómica)."""
+    user_repo_mock.save_if_new.return_value = True
+
+    user_id = handle_create_user(valid_command, user_repo_mock)
+
+    user_repo_mock.save_if_new.assert_called_once()
+    saved_user = user_repo_mock.save_if_new.call_args.args[0]
+    assert saved_user.id == user_id # Sin `user_id` en el comando, el handler genera uno
+    assert saved_user.email == valid_command.email
+    # El handler no hashea: guarda la contraseña tal como llega en el comando
+    assert saved_user.hashed_password == valid_command.password
+    # La unicidad se resuelve en la misma escritura: no se llama a `save`
+    user_repo_mock.save.assert_not_called()
+
+def test_handle_create_user_with_given_id(user_repo_mock):
+    """Prueba que se respete el `user_id` que trae el comando."""
+    command = CreateUserCommand(
+        name="Alice",
+        email="alice@example.com",
+        password="hashed_secret",
+        user_id="123e4567-e89b-12d3-a456-426614174000"
+    )
+    user_repo_mock.save_if_new.return_value = True
+
+    assert handle_create_user(command, user_repo_mock) == command.user_id
+
+def test_handle_create_user_repository_error(valid_command, user_repo_mock):
+    """Prueba que un error del repositorio se relance como RuntimeError."""
+    user_repo_mock.save_if_new.side_effect = Exception("DB Error")
+
+    with pytest.raises(RuntimeError, match="Error al guardar el usuario en el repositorio: DB Error"):
+        handle_create_user(valid_command, user_repo_mock)
+
+def test_handle_create_user_duplicate_email(user_repo_mock):
+    """Prueba que un email ya registrado produzca ValueError."""
+    command = CreateUserCommand(name="Alice", email="alice@example.com", password="hashed_secret")
+    user_repo_mock.save_if_new.return_value = False
+
+    with pytest.raises(ValueError, match="Ya existe un usuario"):
+        handle_create_user(command, user_repo_mock)
+
+    user_repo_mock.save_if_new.assert_called_once()
+
+@pytest.mark.parametrize("invalid_email", ["not-an-email", "", "alice@", "alice@example"])
+def test_handle_create_user_invalid_email_raises_error(invalid_email, user_repo_mock):
+    """Prueba que un email mal formado se rechace antes de llegar al repositorio."""
+    command = CreateUserCommand(name="Alice", email=invalid_email, password="hashed_secret")
+
+    with pytest.raises(ValueError, match="Error al crear la entidad de usuario"):
+        handle_create_user(command, user_repo_mock)
+
+    user_repo_mock.save_if_new.assert_not_called()
 
 # --- Pruebas para handle_get_user ---
 
-def test_handle_get_user_success():
+def test_handle_get_user_success(user_repo_mock):
     """Prueba la obtención exitosa de un usuario."""
     # 1. Arrange
     query = GetUserQuery(user_id="123e4567-e89b-12d3-a456-426614174000")
@@ -30,38 +86,35 @@ def test_handle_get_user_success():
         hashed_password="hashed_secret"
     )
     
-    mock_repo = Mock(spec=UserRepository)
-    mock_repo.get_by_id.return_value = expected_user
+    user_repo_mock.get_by_id.return_value = expected_user
 
     # 2. Act
-    user_result = handle_get_user(query, mock_repo)
+    user_result = handle_get_user(query, user_repo_mock)
 
     # 3. Assert
-    mock_repo.get_by_id.assert_called_once_with(query.user_id)
+    user_repo_mock.get_by_id.assert_called_once_with(query.user_id)
     assert user_result == expected_user
 
-def test_handle_get_user_not_found():
+def test_handle_get_user_not_found(user_repo_mock):
     """Prueba la obtención de un usuario que no existe."""
     query = GetUserQuery(user_id="non-existent-id")
     
-    mock_repo = Mock(spec=UserRepository)
-    mock_repo.get_by_id.return_value = None
+    user_repo_mock.get_by_id.return_value = None
 
-    user_result = handle_get_user(query, mock_repo)
+    user_result = handle_get_user(query, user_repo_mock)
 
-    mock_repo.get_by_id.assert_called_once_with(query.user_id)
+    user_repo_mock.get_by_id.assert_called_once_with(query.user_id)
     assert user_result is None
 
-def test_handle_get_user_repository_error():
+def test_handle_get_user_repository_error(user_repo_mock):
     """Prueba que los errores del repositorio se propagan."""
     query = GetUserQuery(user_id="123e4567-e89b-12d3-a456-426614174000")
     
-    mock_repo = Mock(spec=UserRepository)
     # Simulamos que el repositorio lanza una excepción
-    mock_repo.get_by_id.side_effect = Exception("DB Error")
+    user_repo_mock.get_by_id.side_effect = Exception("DB Error")
 
     # Como handle_get_user no captura excepciones, la excepción se propaga
     with pytest.raises(Exception, match="DB Error"):
-        handle_get_user(query, mock_repo)
+        handle_get_user(query, user_repo_mock)
 
-    mock_repo.get_by_id.assert_called_once_with(query.user_id)
+    user_repo_mock.get_by_id.assert_called_once_with(query.user_id)
@@ -0,0 +1,13 @@
+# tests/users/domain/conftest.py
+"""
+Fixtures compartidas por las pruebas del dominio del contexto 'users'.
+"""
+import pytest
+
+from app.users.domain.models import User
+
+
+@pytest.fixture
+def alice() -> User:
+    """Usuario válido de referencia. Alcance por prueba: algunas pruebas lo mutan (setter de `name`)."""
+    return User("123e4567-e89b-12d3-a456-426614174000", "Alice", "alice@example.com", "hashed_password_123")
@@ -16,48 +16,55 @@ def test_user_creation_valid():
     assert user.email == email.lower() # Verifica normalización
     assert user.hashed_password == hashed_password
 
-def test_user_creation_invalid_email():
+@pytest.mark.parametrize("invalid_email", ["not-an-email", "", "bob@", "@example.com", "bob@example", "bob example@example.com"])
+def test_user_creation_invalid_email(invalid_email):
     """Prueba que se lance InvalidEmailError con un email inválido."""
-    user_id = "123e4567-e89b-12d3-a456-426614174000"
-    name = "Bob"
-    invalid_email = "not-an-email"
-    hashed_password = "hashed_password_123"
-
     with pytest.raises(InvalidEmailError):
-        User(user_id, name, invalid_email, hashed_password)
+        User("123e4567-e89b-12d3-a456-426614174000", "Bob", invalid_email, "hashed_password_123")
+
+# El usuario de referencia `alice` viene de conftest.py (uno nuevo por prueba)
 
-def test_user_name_setter_valid():
+def test_user_name_setter_valid(alice):
     """Prueba el setter de name con un valor válido."""
-    user = User("123e4567-e89b-12d3-a456-426614174000", "Alice", "alice@example.com", "hashed_password_123")
     new_name = "Alice Cooper"
     
-    user.name = new_name
+    alice.name = new_name
     
-    assert user.name == new_name
-
-def test_user_name_setter_invalid_empty():
-    """Prueba que el setter de name lance ValueError con un nombre vacío."""
-    user = User("123e4567-e89b-12d3-a456-426614174000", "Alice", "alice@example.com", "hashed_password_123")
-    
-    with pytest.raises(ValueError, match="El nombre no puede estar vacío."):
-        user.name = ""
+    assert alice.name == new_name
 
-def test_user_name_setter_invalid_whitespace():
+@pytest.mark.parametrize("bad_name", ["", " ", "   ", "\t"])
+def test_user_name_setter_rejects_blank(alice, bad_name):
     """Prueba que el setter de name limpie espacios y lance ValueError si queda vacío."""
-    user = User("123e4567-e89b-12d3-a456-426614174000", "Alice", "alice@example.com", "hashed_password_123")
-    
     with pytest.raises(ValueError, match="El nombre no puede estar vacío."):
-        user.name = "   "
+        alice.name = bad_name
 
-def test_user_equality():
+def test_user_equality(alice):
     """Prueba la igualdad de usuarios basada en ID."""
-    user_id = "123e4567-e89b-12d3-a456-426614174000"
-    user1 = User(user_id, "Alice", "alice@example.com", "hashed_password_123")
-    user2 = User(user_id, "Bob", "bob@example.com", "different_hashed_password")
-    user3 = User("different-id", "Alice", "alice@example.com", "hashed_password_123")
+    same_id = User(alice.id, "Bob", "bob@example.com", "different_hashed_password")
+    other_id = User("different-id", "Alice", "alice@example.com", "hashed_password_123")
     
-    assert user1 == user2 # Mismo ID
-    assert user1 != user3 # Diferente ID
-    assert user1 != "not a user" # Tipo diferente
+    assert alice == same_id # Mismo ID
+    assert alice != other_id # Diferente ID
+    assert alice != "not a user" # Tipo diferente
+
+def test_user_uses_slots(alice):
+    """Prueba que User no reserve un __dict__ por instancia ni acepte atributos nuevos."""
+    assert not hasattr(alice, "__dict__")
+    with pytest.raises(AttributeError):
+        alice.extra = "no permitido" # type: ignore
+
+def test_user_from_row_skips_validation():
+    """Prueba que from_row rehidrate un usuario persistido sin pasar por la validación de __init__."""
+    user_id = "123e4567-e89b-12d3-a456-426614174000"
+    user = User.from_row(user_id=user_id, name="Alice", email="alice@example.com", hashed_password="hashed_password_123")
+
+    assert user == User(user_id, "Alice", "alice@example.com", "hashed_password_123")
+    assert user.name == "Alice"
+    assert user.email == "alice@example.com"
+    assert user.hashed_password == "hashed_password_123"
+
+    # Los datos vienen de persistencia (de confianza): no se vuelve a validar el email
+    legacy = User.from_row(user_id=user_id, name="Alice", email="legacy-email", hashed_password="hashed_password_123")
+    assert legacy.email == "legacy-email"
 
 # Puedes añadir más pruebas para otros aspectos como __repr__, email en mayúsculas que se normalice, etc.
\ No newline at end of file
@@ -6,7 +6,7 @@
 import pytest
 from abc import ABC, abstractmethod
 from typing import Optional
-from app.users.domain.models import User
+from app.users.domain.models import User, UserNotFoundError
 # Importamos la interfaz a probar
 from app.users.domain.repositories import UserRepository
 
@@ -19,16 +19,36 @@ class MockUserRepository(UserRepository):
     def save(self, user: User) -> None:
         self._users[user.id] = user
 
+    def save_if_new(self, user: User) -> bool:
+        if any(u.email == user.email for u in self._users.values()):
+            return False
+        self._users[user.id] = user
+        return True
+
+    def update(self, user: User) -> None:
+        if user.id not in self._users:
+            raise UserNotFoundError(f"No existe un usuario con ID '{user.id}'.")
+        self._users[user.id] = user
+
+    def delete(self, user_id: str) -> bool:
+        return self._users.pop(user_id, None) is not None
+
     def get_by_id(self, user_id: str) -> Optional[User]:
         return self._users.get(user_id)
 
+# --- Fixtures ---
+@pytest.fixture
+def mock_repo():
+    """Repositorio en memoria vacío para cada prueba."""
+    return MockUserRepository()
+
 # --- Pruebas para el contrato UserRepository ---
 # Estas pruebas verifican que cualquier implementación de UserRepository
 # debe comportarse de cierta manera.
 
-def test_user_repository_save_and_get_by_id():
+def test_user_repository_save_and_get_by_id(mock_repo):
     """Prueba que save y get_by_id funcionen como se espera del contrato."""
-    repo = MockUserRepository() # Usamos nuestro mock
+    repo = mock_repo # Usamos nuestro mock
     user = User("123", "Alice", "alice@example.com", "hashed_pass")
 
     # Guardar el usuario
@@ -45,9 +65,22 @@ def test_user_repository_save_and_get_by_id():
     assert retrieved_user.email == "alice@example.com"
     assert retrieved_user.hashed_password == "hashed_pass"
 
-def test_user_repository_get_by_id_not_found():
+def test_user_repository_save_if_new_rejects_duplicate_email(mock_repo):
+    """Prueba que save_if_new no guarde un segundo usuario con el mismo email."""
+    repo = mock_repo
+    user = User("123", "Alice", "alice@example.com", "hashed_pass")
+    duplicate = User("456", "Alice Bis", "alice@example.com", "hashed_pass")
+
+    assert repo.save_if_new(user) is True
+    assert repo.save_if_new(duplicate) is False
+
+    # Solo el primer usuario queda guardado
+    assert repo.get_by_id("123") == user
+    assert repo.get_by_id("456") is None
+
+def test_user_repository_get_by_id_not_found(mock_repo):
     """Prueba que get_by_id devuelva None si el usuario no existe."""
-    repo = MockUserRepository()
+    repo = mock_repo
 
     # Intentar recuperar un usuario que no existe
     retrieved_user = repo.get_by_id("non-existent-id")
@@ -55,6 +88,21 @@ def test_user_repository_get_by_id_not_found():
     # Verificar que se devuelve None
     assert retrieved_user is None
 
+def test_user_repository_update_and_delete(mock_repo):
+    """Prueba que update reemplace al usuario existente y delete indique si existía."""
+    repo = mock_repo
+    repo.save(User("123", "Alice", "alice@example.com", "hashed_pass"))
+
+    repo.update(User("123", "Alice Cooper", "alice@example.com", "hashed_pass"))
+    assert repo.get_by_id("123").name == "Alice Cooper"
+
+    with pytest.raises(UserNotFoundError):
+        repo.update(User("456", "Bob", "bob@example.com", "hashed_pass"))
+
+    assert repo.delete("123") is True
+    assert repo.delete("123") is False
+    assert repo.get_by_id("123") is None
+
 # --- Prueba para verificar que UserRepository es una interfaz abstracta ---
 # Esto asegura que no se pueda instanciar directamente y que tenga métodos abstractos.
 
@@ -64,12 +112,5 @@ def test_user_repository_is_abstract():
     with pytest.raises(TypeError):
         UserRepository() # type: ignore
 
-    # Verificar que los métodos sean abstractos
-    # Esta prueba es más técnica y opcional, pero útil para asegurar la definición.
-    assert hasattr(UserRepository, 'save')
-    assert hasattr(UserRepository.save, '__isabstractmethod__')
-    assert UserRepository.save.__isabstractmethod__ is True # type: ignore
-    
-    assert hasattr(UserRepository, 'get_by_id')
-    assert hasattr(UserRepository.get_by_id, '__isabstractmethod__')
-    assert UserRepository.get_by_id.__isabstractmethod__ is True # type: ignore
+    # Verificar que los métodos sean abstractos: ABCMeta mantiene el conjunto en `__abstractmethods__`
+    assert UserRepository.__abstractmethods__ == frozenset({"save", "save_if_new", "update", "delete", "get_by_id"})
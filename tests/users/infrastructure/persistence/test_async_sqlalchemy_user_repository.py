@@ -0,0 +1,157 @@
+# tests/users/infrastructure/persistence/test_async_sqlalchemy_user_repository.py
+"""
+Pruebas del adaptador AsyncSQLAlchemyUserRepository contra SQLite en memoria (driver `aiosqlite`).
+Cada prueba crea su propio motor asíncrono y esquema (BD desechable en memoria) y se ejecuta con
+`asyncio.run`, sin depender de un plugin de pytest para corutinas.
+"""
+import asyncio
+import uuid
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.users.domain.models import User, UserNotFoundError, UserPersistenceError
+from app.users.infrastructure.persistence.async_repositories import AsyncSQLAlchemyUserRepository
+from app.users.infrastructure.persistence.database import Base
+from app.users.infrastructure.persistence.user_cache import clear_user_cache
+# Registra la tabla `users` en Base.metadata
+from app.users.infrastructure.persistence.user_model import UserModel
+
+_USER_ID = "123e4567-e89b-12d3-a456-426614174000"
+_OTHER_ID = "223e4567-e89b-12d3-a456-426614174000"
+
+
+@pytest.fixture(autouse=True)
+def _empty_user_cache():
+    """La caché de lecturas es de proceso y cada prueba usa una BD nueva: se vacía entre pruebas."""
+    clear_user_cache()
+    yield
+    clear_user_cache()
+
+
+def _new_user(user_id: str = _USER_ID, email: str = "alice@example.com", name: str = "Alice") -> User:
+    """Crea un User de dominio válido."""
+    return User(user_id, name, email, "hashed_password_123")
+
+
+def _run(scenario) -> None:
+    """Ejecuta `scenario(session)` sobre una BD SQLite en memoria recién creada."""
+    async def _main():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+
+        # Como en tests/conftest.py: el driver gestiona BEGIN por su cuenta y rompe los SAVEPOINT
+        @event.listens_for(engine.sync_engine, "connect")
+        def _disable_driver_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=[UserModel.__table__])
+            async with AsyncSession(engine, autoflush=False, expire_on_commit=False) as session:
+                await scenario(session)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_main())
+
+
+# --- Pruebas ---
+
+def test_save_then_get_by_id_and_email():
+    """Prueba que un usuario guardado se recupere por ID (str o UUID) y por email."""
+    user = _new_user()
+
+    async def scenario(session):
+        repo = AsyncSQLAlchemyUserRepository(session)
+        await repo.save(user)
+        await session.commit()
+
+        assert await repo.get_by_id(user.id) == user
+        assert await repo.get_by_id(uuid.UUID(user.id)) == user
+        assert await repo.get_by_email(user.email) == user
+        assert await repo.get_by_id(_OTHER_ID) is None
+        assert await repo.get_by_email("nobody@example.com") is None
+
+    _run(scenario)
+
+def test_save_duplicate_email_keeps_transaction_usable():
+    """Prueba que el SAVEPOINT de `save` traduzca el error y no aborte la transacción exterior."""
+    user = _new_user()
+
+    async def scenario(session):
+        repo = AsyncSQLAlchemyUserRepository(session)
+        await repo.save(user)
+
+        with pytest.raises(UserPersistenceError) as exc_info:
+            await repo.save(_new_user(_OTHER_ID))
+
+        assert isinstance(exc_info.value.__cause__, IntegrityError)
+        assert (await session.execute(text("SELECT 1"))).scalar() == 1
+        assert await repo.get_by_id(user.id) == user
+
+    _run(scenario)
+
+def test_save_if_new_rejects_duplicate_email():
+    """Prueba que save_if_new no inserte un segundo usuario con el mismo email."""
+    async def scenario(session):
+        repo = AsyncSQLAlchemyUserRepository(session)
+        assert await repo.save_if_new(_new_user()) is True
+        assert await repo.save_if_new(_new_user(_OTHER_ID)) is False
+        assert await repo.get_by_id(_OTHER_ID) is None
+
+    _run(scenario)
+
+def test_update_existing_and_missing_user():
+    """Prueba que update modifique la fila existente y lance UserNotFoundError si no existe."""
+    async def scenario(session):
+        repo = AsyncSQLAlchemyUserRepository(session)
+        await repo.save(_new_user())
+        await session.commit()
+        assert (await repo.get_by_id(_USER_ID)).name == "Alice" # Queda cacheado
+
+        await repo.update(_new_user(name="Alice Cooper", email="cooper@example.com"))
+        await session.commit() # El commit invalida la entrada cacheada
+
+        updated = await repo.get_by_id(_USER_ID)
+        assert updated.name == "Alice Cooper"
+        assert updated.email == "cooper@example.com"
+        assert await repo.get_by_email("alice@example.com") is None
+
+        with pytest.raises(UserNotFoundError):
+            await repo.update(_new_user(_OTHER_ID, email="bob@example.com"))
+
+    _run(scenario)
+
+def test_delete_returns_whether_user_existed():
+    """Prueba que delete devuelva True la primera vez y False cuando ya no existe."""
+    async def scenario(session):
+        repo = AsyncSQLAlchemyUserRepository(session)
+        await repo.save(_new_user())
+        await session.commit()
+        assert await repo.get_by_id(_USER_ID) is not None # Queda cacheado
+
+        assert await repo.delete(_USER_ID) is True
+        assert await repo.delete(_USER_ID) is False
+        await session.commit()
+
+        assert await repo.get_by_id(_USER_ID) is None
+
+    _run(scenario)
+
+def test_rolled_back_write_is_not_served_from_cache():
+    """Prueba que una escritura revertida no deje nada en la caché compartida."""
+    async def scenario(session):
+        repo = AsyncSQLAlchemyUserRepository(session)
+        await repo.save(_new_user())
+        assert await repo.get_by_id(_USER_ID) is not None # Visible dentro de su transacción
+        await session.rollback()
+
+        assert await repo.get_by_id(_USER_ID) is None
+
+    _run(scenario)
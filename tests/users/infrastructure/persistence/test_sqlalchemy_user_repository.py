@@ -0,0 +1,275 @@
+# tests/users/infrastructure/persistence/test_sqlalchemy_user_repository.py
+"""
+Pruebas de integración del adaptador SQLAlchemyUserRepository contra una base de datos real.
+El motor, el esquema y la sesión aislada por prueba (`test_db_session`) vienen de tests/conftest.py:
+el esquema se crea una vez por sesión y cada prueba termina con un ROLLBACK (sin create_all/drop_all por prueba).
+"""
+import uuid
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.users.domain.models import User, UserNotFoundError, UserPersistenceError
+from app.users.infrastructure.persistence.repositories import SQLAlchemyUserRepository
+from app.users.infrastructure.persistence.user_cache import cache_user, clear_user_cache, read_snapshot
+
+_USER_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+@pytest.fixture(autouse=True)
+def _empty_user_cache():
+    """
+    La caché de lecturas es de proceso. Lo que una prueba confirma con `commit()` lo deshace después
+    el ROLLBACK externo de `test_db_session` (algo que la app nunca hace), así que se vacía entre pruebas.
+    """
+    clear_user_cache()
+    yield
+    clear_user_cache()
+
+
+@pytest.fixture
+def repo(test_db_session) -> SQLAlchemyUserRepository:
+    """Repositorio sobre la sesión aislada de la prueba."""
+    return SQLAlchemyUserRepository(test_db_session)
+
+
+def _new_user(user_id: str = _USER_ID, email: str = "alice@example.com") -> User:
+    """Crea un User de dominio válido."""
+    return User(user_id, "Alice", email, "hashed_password_123")
+
+
+# --- Pruebas ---
+
+def test_get_user_by_id_success(repo, seed_users, count_queries):
+    """Prueba que un usuario sembrado en la BD se recupere por su ID."""
+    user = _new_user()
+    seed_users([
+        {"id": user.id, "name": user.name, "email": user.email, "hashed_password": user.hashed_password},
+        {"id": "223e4567-e89b-12d3-a456-426614174000", "name": "Bob", "email": "bob@example.com", "hashed_password": "x"},
+    ])
+
+    with count_queries() as queries:
+        found_user = repo.get_by_id(user.id)
+        cached_user = repo.get_by_id(user.id)
+
+    # Un solo SELECT (sin cargas perezosas extra) y la segunda lectura sale de la caché
+    assert len(queries) == 1
+    assert cached_user == found_user
+    assert cached_user is not found_user # Cada acierto construye un User nuevo
+    assert found_user == user
+    assert found_user.name == user.name
+    assert found_user.email == user.email
+    assert found_user.hashed_password == user.hashed_password
+
+def test_get_user_by_id_accepts_uuid_with_same_cache_key(repo, seed_users, count_queries):
+    """Prueba que un `uuid.UUID` encuentre al usuario y comparta la entrada de caché de su forma `str`."""
+    user = _new_user()
+    seed_users([{"id": user.id, "name": user.name, "email": user.email, "hashed_password": user.hashed_password}])
+
+    with count_queries() as queries:
+        found_user = repo.get_by_id(user.id)
+        cached_user = repo.get_by_id(uuid.UUID(user.id))
+
+    assert len(queries) == 1 # La forma UUID salió de la entrada cacheada por la forma str
+    assert found_user == cached_user == user
+
+def test_get_user_by_id_not_found(repo):
+    """Prueba que get_by_id devuelva None si el usuario no existe."""
+    assert repo.get_by_id("00000000-0000-0000-0000-000000000000") is None
+
+def test_mutating_returned_user_does_not_change_cache(repo, seed_users):
+    """Prueba que modificar el User devuelto no altere lo que reciben los siguientes lectores."""
+    user = _new_user()
+    seed_users([{"id": user.id, "name": user.name, "email": user.email, "hashed_password": user.hashed_password}])
+
+    repo.get_by_id(user.id).name = "Mallory"
+
+    assert repo.get_by_id(user.id).name == "Alice"
+
+def test_get_user_by_email_is_not_cached(repo, seed_users, count_queries):
+    """Prueba que la búsqueda del login (por email) vaya siempre a la BD."""
+    user = _new_user()
+    seed_users([{"id": user.id, "name": user.name, "email": user.email, "hashed_password": user.hashed_password}])
+
+    with count_queries() as queries:
+        assert repo.get_by_email(user.email) == user
+        assert repo.get_by_email(user.email) == user
+
+    assert len(queries) == 2
+
+def test_get_user_by_email_among_many(repo, user_factory):
+    """Prueba que get_by_email encuentre el usuario correcto entre muchos."""
+    users = user_factory(100)
+    target = users[42]
+
+    found_user = repo.get_by_email(target.email)
+
+    assert found_user == target
+    assert found_user.name == target.name
+
+def test_save_if_new_rejects_duplicate_email(repo):
+    """Prueba que save_if_new no inserte un segundo usuario con el mismo email."""
+    assert repo.save_if_new(_new_user()) is True
+    assert repo.save_if_new(_new_user("223e4567-e89b-12d3-a456-426614174000")) is False
+
+    assert repo.get_by_id("223e4567-e89b-12d3-a456-426614174000") is None
+
+def test_update_existing_user(repo, seed_users, test_db_session):
+    """Prueba que update modifique la fila existente con un solo UPDATE."""
+    user = _new_user()
+    seed_users([{"id": user.id, "name": user.name, "email": user.email, "hashed_password": user.hashed_password}])
+
+    repo.update(User(user.id, "Alice Cooper", user.email, "new_hash"))
+    test_db_session.expire_all() # Releer de la BD, no del mapa de identidad
+
+    updated = repo.get_by_id(user.id)
+    assert updated.name == "Alice Cooper"
+    assert updated.hashed_password == "new_hash"
+
+def test_update_missing_user_raises_not_found(repo):
+    """Prueba que update lance UserNotFoundError si no existe el ID."""
+    with pytest.raises(UserNotFoundError):
+        repo.update(_new_user())
+
+def test_delete_returns_whether_user_existed(repo, seed_users):
+    """Prueba que delete devuelva True la primera vez y False cuando ya no existe."""
+    user = _new_user()
+    seed_users([{"id": user.id, "name": user.name, "email": user.email, "hashed_password": user.hashed_password}])
+
+    assert repo.delete(user.id) is True
+    assert repo.delete(user.id) is False
+    assert repo.get_by_id(user.id) is None
+
+def test_committed_email_change_evicts_cached_user(repo, seed_users, test_db_session):
+    """Prueba que cambiar el email invalide la entrada cacheada y el email anterior deje de encontrarse."""
+    user = _new_user()
+    seed_users([{"id": user.id, "name": user.name, "email": user.email, "hashed_password": user.hashed_password}])
+    assert repo.get_by_id(user.id).email == "alice@example.com" # Queda cacheado
+
+    repo.update(User(user.id, user.name, "alice.cooper@example.com", user.hashed_password))
+    test_db_session.commit()
+
+    assert repo.get_by_id(user.id).email == "alice.cooper@example.com"
+    assert repo.get_by_email("alice@example.com") is None
+    assert repo.get_by_email("alice.cooper@example.com") == user
+
+def test_rolled_back_write_is_not_served_from_cache(repo, test_db_session):
+    """Prueba que ni la escritura ni la lectura de una transacción revertida queden en la caché."""
+    user = _new_user()
+    assert repo.save_if_new(user) is True
+    assert repo.get_by_id(user.id) == user # Visible dentro de su propia transacción
+
+    test_db_session.rollback()
+
+    # Un repositorio nuevo (otra petición) no debe ver al usuario revertido
+    assert SQLAlchemyUserRepository(test_db_session).get_by_id(user.id) is None
+
+def test_committed_write_evicts_cached_user(repo, seed_users, test_db_session):
+    """Prueba que un update invalide la caché solo al hacer commit."""
+    user = _new_user()
+    seed_users([{"id": user.id, "name": user.name, "email": user.email, "hashed_password": user.hashed_password}])
+    assert repo.get_by_id(user.id).name == "Alice" # Queda cacheado
+
+    repo.update(User(user.id, "Alice Cooper", user.email, user.hashed_password))
+    assert repo.get_by_id(user.id).name == "Alice" # Sin commit: otros lectores siguen viendo lo confirmado
+
+    test_db_session.commit()
+    assert repo.get_by_id(user.id).name == "Alice Cooper"
+
+def test_committed_save_and_delete_evict_cached_user(repo, test_db_session):
+    """Prueba que un save y un delete confirmados invaliden la entrada cacheada."""
+    user = _new_user()
+    # Entrada obsoleta (p.ej. de antes de un borrado en otro proceso) bajo el mismo ID
+    cache_user(User(user.id, "Stale", user.email, user.hashed_password), read_snapshot(test_db_session))
+
+    repo.save(user)
+    test_db_session.commit()
+    assert repo.get_by_id(user.id) == user # El commit del save invalidó la entrada obsoleta
+    assert repo.get_by_id(user.id).name == "Alice" # ... y la lectura volvió a cachearse
+
+    assert repo.delete(user.id) is True
+    test_db_session.commit()
+    assert repo.get_by_id(user.id) is None
+
+def test_save_user_duplicate_email_raises_integrity_error(repo, test_db_session):
+    """Prueba que la violación del índice único se traduzca a UserPersistenceError sin abortar la transacción."""
+    user = _new_user()
+    repo.save(user)
+
+    with pytest.raises(UserPersistenceError) as exc_info:
+        repo.save(_new_user("223e4567-e89b-12d3-a456-426614174000"))
+
+    assert isinstance(exc_info.value.__cause__, IntegrityError)
+    # Solo se revirtió el SAVEPOINT de `save`: la transacción sigue viva y conserva el primer usuario
+    assert test_db_session.execute(text("SELECT 1")).scalar() == 1
+    assert repo.get_by_id(user.id) == user
+
+def test_save_if_new_clashing_id_keeps_transaction_usable(repo, test_db_session):
+    """Prueba que un error de save_if_new ajeno al email (PK repetida) solo revierta su SAVEPOINT."""
+    user = _new_user()
+    assert repo.save_if_new(user) is True
+
+    with pytest.raises(UserPersistenceError) as exc_info:
+        repo.save_if_new(_new_user(email="other@example.com")) # Mismo ID, otro email
+
+    assert isinstance(exc_info.value.__cause__, IntegrityError)
+    assert test_db_session.execute(text("SELECT 1")).scalar() == 1
+    assert repo.get_by_id(user.id) == user
+
+def test_write_methods_leave_session_usable_after_failure(repo):
+    """Prueba que tras un fallo de save o save_if_new la siguiente escritura funcione sin `rollback` previo."""
+    user = _new_user()
+    repo.save(user)
+
+    with pytest.raises(UserPersistenceError):
+        repo.save(_new_user("223e4567-e89b-12d3-a456-426614174000")) # Email repetido
+    with pytest.raises(UserPersistenceError):
+        repo.save_if_new(_new_user(email="other@example.com")) # ID repetido
+
+    # Ni PendingRollbackError ni transacción abortada: ambos métodos se comportan igual
+    assert repo.save_if_new(_new_user("323e4567-e89b-12d3-a456-426614174000", "carol@example.com")) is True
+    repo.save(_new_user("423e4567-e89b-12d3-a456-426614174000", "dave@example.com"))
+    assert repo.get_by_id("423e4567-e89b-12d3-a456-426614174000") is not None
+
+def test_save_translates_integrity_error_without_db():
+    """Prueba unitaria (sesión simulada, sin BD) de la traducción IntegrityError -> UserPersistenceError."""
+    session = MagicMock()
+    cause = IntegrityError("INSERT INTO users ...", {}, Exception("duplicate key"))
+    # El flush ocurre al liberar el SAVEPOINT de `save` (salida del bloque `begin_nested`)
+    session.begin_nested.return_value.__exit__.side_effect = cause
+    repo = SQLAlchemyUserRepository(session)
+
+    with pytest.raises(RuntimeError) as exc_info: # UserPersistenceError hereda de RuntimeError
+        repo.save(_new_user())
+
+    assert isinstance(exc_info.value, UserPersistenceError)
+    assert exc_info.value.__cause__ is cause
+    session.add.assert_called_once()
+
+def test_save_if_new_runs_inside_savepoint_without_db():
+    """Prueba unitaria (sesión simulada): el INSERT de save_if_new va dentro de `begin_nested`."""
+    session = MagicMock()
+    cause = IntegrityError("INSERT INTO users ...", {}, Exception("duplicate key"))
+    session.scalar.side_effect = cause
+    repo = SQLAlchemyUserRepository(session)
+
+    with pytest.raises(UserPersistenceError) as exc_info:
+        repo.save_if_new(_new_user())
+
+    assert exc_info.value.__cause__ is cause
+    session.begin_nested.assert_called_once()
+    # El error se propagó a través del bloque del SAVEPOINT (que lo revierte al salir)
+    exit_args = session.begin_nested.return_value.__exit__.call_args.args
+    assert exit_args[1] is cause
+
+def test_duplicate_email_is_rejected_by_covering_index(repo, test_db_session):
+    """Prueba (solo PostgreSQL) que la unicidad del email la garantiza el índice covering `ix_users_email_covering`."""
+    if test_db_session.get_bind().dialect.name != "postgresql":
+        pytest.skip("El nombre de la restricción en el error es específico de PostgreSQL")
+    repo.save(_new_user())
+
+    with pytest.raises(UserPersistenceError) as exc_info:
+        repo.save(_new_user("223e4567-e89b-12d3-a456-426614174000"))
+
+    assert "ix_users_email_covering" in str(exc_info.value.__cause__)